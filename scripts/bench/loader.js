@@ -0,0 +1,29 @@
+// Module hooks so Node can import the app's source files directly: import
+// specifiers without an extension are resolved the way Vite resolves them,
+// and .jsx files that contain no JSX are loaded as plain ES modules.
+
+const EXTENSIONS = ['.js', '.jsx'];
+
+export async function resolve(specifier, context, nextResolve) {
+  try {
+    return await nextResolve(specifier, context);
+  } catch (error) {
+    if (error.code !== 'ERR_MODULE_NOT_FOUND' || !specifier.startsWith('.')) throw error;
+
+    for (const extension of EXTENSIONS) {
+      try {
+        return await nextResolve(specifier + extension, context);
+      } catch {
+        // Try the next extension
+      }
+    }
+    throw error;
+  }
+}
+
+export async function load(url, context, nextLoad) {
+  if (url.endsWith('.jsx')) {
+    return nextLoad(url, { ...context, format: 'module' });
+  }
+  return nextLoad(url, context);
+}
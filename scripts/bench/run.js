@@ -0,0 +1,246 @@
+// Benchmark suite
+// Runs the client's hot paths against a synthetic book and fails when any of
+// them is slower than its threshold in thresholds.json.
+//
+//   npm run bench                      # 10k policies / ledger rows
+//   npm run bench -- --scale 100k
+//   NODE_OPTIONS=--max-old-space-size=8192 npm run bench -- --scale 1m --only accrual,batchTax --runs 3
+//
+// Every benchmark runs once to warm up (JIT, caches) and is then timed --runs
+// times (default 5); the median is compared with the threshold, so one slow
+// run on a busy machine does not fail the gate. Thresholds are generous
+// (roughly 2-3x the median on a small CI machine) so they catch algorithmic
+// regressions, not machine-to-machine noise.
+
+import { readFileSync } from 'node:fs';
+import { generateBook, ledgerPages } from './syntheticBook.js';
+import { policiesToAccrualColumns, accrueRoiBatch, compoundInterest, projectBalance } from '../../src/utils/calculations.jsx';
+import { calculateInvestmentTaxesBatch } from '../../src/utils/nigerianTaxCalculator.js';
+import { LedgerAggregates } from '../../src/utils/ledgerAggregates.js';
+import { SearchIndex } from '../../src/utils/searchIndex.js';
+import { writeLedgerCsv } from '../../src/utils/ledgerExport.js';
+import { buildDirectory } from '../../src/utils/directory.js';
+
+const SCALES = { '10k': 10000, '100k': 100000, '1m': 1000000 };
+const SEARCH_QUERIES = 100;
+const DEFAULT_RUNS = 5;
+const SEARCH_FIELDS = inv => [inv.name, inv.uniquePolicy, inv.email, inv.phoneNumber, inv.accountNumber];
+
+const parseArgs = (argv) => {
+  const args = { scale: '10k', only: null, runs: DEFAULT_RUNS };
+  for (let i = 0; i < argv.length; i++) {
+    if (argv[i] === '--scale') args.scale = argv[++i];
+    else if (argv[i] === '--only') args.only = argv[++i].split(',');
+    else if (argv[i] === '--runs') args.runs = Number(argv[++i]);
+  }
+  if (!SCALES[args.scale]) {
+    throw new Error(`Unknown scale ${args.scale}; use one of ${Object.keys(SCALES).join(', ')}`);
+  }
+  if (!Number.isInteger(args.runs) || args.runs < 1) {
+    throw new Error('--runs must be a positive integer');
+  }
+  return args;
+};
+
+// Benchmarks that time their own operations return { ms, result }, e.g. a
+// per-query p99 instead of the time taken by the whole batch
+const time = async (fn) => {
+  const started = performance.now();
+  const outcome = await fn();
+  const elapsed = performance.now() - started;
+  return typeof outcome === 'object' ? outcome : { ms: elapsed, result: outcome };
+};
+
+const percentile = (samples, fraction) => {
+  const sorted = [...samples].sort((a, b) => a - b);
+  return sorted[Math.min(sorted.length - 1, Math.ceil(sorted.length * fraction) - 1)];
+};
+
+// One untimed warm-up run, then the median of `runs` timed runs
+const timeRuns = async (fn, runs) => {
+  await fn();
+  const samples = [];
+  let result;
+  for (let i = 0; i < runs; i++) {
+    const outcome = await time(fn);
+    samples.push(outcome.ms);
+    result = outcome.result;
+  }
+  return { ms: percentile(samples, 0.5), min: Math.min(...samples), max: Math.max(...samples), result };
+};
+
+// Time each query on its own and report the p99 latency
+const timeQueries = (queries, search) => {
+  const samples = [];
+  let hits = 0;
+  queries.forEach(query => {
+    const started = performance.now();
+    hits += search(query);
+    samples.push(performance.now() - started);
+  });
+  return {
+    ms: percentile(samples, 0.99),
+    result: `p99 per query; p50 ${percentile(samples, 0.5).toFixed(2)} ms, ${queries.length} queries, ${hits} hits`,
+  };
+};
+
+// The .filter(...includes...) path the investor tables used before the index
+const filterInvestors = (investors, searchTerm) =>
+  investors.filter(inv =>
+    inv.name.toLowerCase().includes(searchTerm.toLowerCase()) ||
+    inv.uniquePolicy?.toLowerCase().includes(searchTerm.toLowerCase())
+  ).length;
+
+// Each benchmark gets the prepared fixtures and returns a short description
+// of its output, which doubles as a sanity check that the work was done
+const BENCHMARKS = [
+  {
+    name: 'accrual',
+    run: ({ book }) => {
+      const { balance } = accrueRoiBatch(policiesToAccrualColumns(book.policies), 12);
+      return `${balance.length} policies x 12 months`;
+    },
+  },
+  {
+    name: 'compoundInterest',
+    run: ({ book }) => {
+      let total = 0;
+      book.policies.forEach(policy => {
+        total += compoundInterest(parseFloat(policy.principal_amount), parseFloat(policy.roi_rate), 12).balance;
+      });
+      return `total ${total.toFixed(2)}`;
+    },
+  },
+  {
+    name: 'projectBalance',
+    run: ({ book }) => {
+      let total = 0;
+      book.policies.forEach(policy => {
+        total += projectBalance(parseFloat(policy.principal_amount), parseFloat(policy.roi_rate), 12);
+      });
+      return `total ${total.toFixed(2)}`;
+    },
+  },
+  {
+    name: 'batchTax',
+    run: ({ book }) => {
+      const roiAmounts = book.policies.map(policy => policy.roi_balance);
+      const annualIncomes = book.policies.map(policy => parseFloat(policy.principal_amount) * 0.4);
+      const { totalTax } = calculateInvestmentTaxesBatch({ roiAmounts, annualIncomes });
+      return `${totalTax.length} payments`;
+    },
+  },
+  {
+    name: 'ledgerSummary',
+    run: async ({ pages }) => {
+      const aggregates = await LedgerAggregates.rebuild(pages);
+      return `${aggregates.totals.entry_count} entries, ${aggregates.byPolicy.size} policies`;
+    },
+  },
+  {
+    name: 'ledgerExport',
+    run: async ({ pages }) => {
+      const blob = await writeLedgerCsv(pages);
+      return `${(blob.size / 1024 / 1024).toFixed(1)} MB CSV`;
+    },
+  },
+  {
+    name: 'directory',
+    run: ({ book }) => {
+      const { investors } = buildDirectory(book.users, book.policies);
+      return `${investors.length} investors`;
+    },
+  },
+  {
+    name: 'searchBuild',
+    run: (fixtures) => {
+      fixtures.searchIndex = new SearchIndex();
+      fixtures.searchIndex.sync(fixtures.investors, inv => inv.id, SEARCH_FIELDS);
+      return `${fixtures.searchIndex.size} records`;
+    },
+  },
+  {
+    // A refetched directory: new objects with the same values, which sync()
+    // should recognise as unchanged
+    name: 'searchResync',
+    needs: ['searchBuild'],
+    run: ({ searchIndex, investors }) => {
+      const refetched = investors.map(inv => ({ ...inv }));
+      const started = performance.now();
+      searchIndex.sync(refetched, inv => inv.id, SEARCH_FIELDS);
+      return { ms: performance.now() - started, result: `${searchIndex.size} records` };
+    },
+  },
+  {
+    name: 'searchByName',
+    needs: ['searchBuild'],
+    run: ({ searchIndex, nameQueries }) =>
+      timeQueries(nameQueries, query => searchIndex.search(query, { limit: 20 }).total),
+  },
+  {
+    name: 'searchByPolicy',
+    needs: ['searchBuild'],
+    run: ({ searchIndex, policyQueries }) =>
+      timeQueries(policyQueries, query => searchIndex.search(query, { limit: 20 }).total),
+  },
+  {
+    // Baselines for the two above; reported, not gated
+    name: 'filterByName',
+    run: ({ investors, nameQueries }) => timeQueries(nameQueries, query => filterInvestors(investors, query)),
+  },
+  {
+    name: 'filterByPolicy',
+    run: ({ investors, policyQueries }) => timeQueries(policyQueries, query => filterInvestors(investors, query)),
+  },
+];
+
+const main = async () => {
+  const { scale, only, runs } = parseArgs(process.argv.slice(2));
+  const size = SCALES[scale];
+  const thresholds = JSON.parse(readFileSync(new URL('./thresholds.json', import.meta.url), 'utf8'));
+
+  console.log(`Generating book: ${size} policies, ${size} ledger rows; median of ${runs} run(s) after a warm-up...`);
+  const book = generateBook({ seed: 42, tenants: 4, policies: size });
+  const pages = [...ledgerPages(book, { limit: size })];
+  const { investors } = buildDirectory(book.users, book.policies);
+  const sampleInvestors = Array.from({ length: SEARCH_QUERIES }, (_, i) => investors[(i * 7919) % investors.length]);
+  const fixtures = {
+    book,
+    pages,
+    investors,
+    nameQueries: sampleInvestors.map(investor => investor.name.split(' ')[1]),
+    policyQueries: sampleInvestors.map(investor => investor.uniquePolicy.slice(-6)),
+    searchIndex: null,
+  };
+
+  // --only also runs whatever the selected benchmarks need
+  const selected = only && new Set(only.flatMap(name => [
+    name,
+    ...(BENCHMARKS.find(benchmark => benchmark.name === name)?.needs || []),
+  ]));
+
+  let failures = 0;
+  for (const benchmark of BENCHMARKS) {
+    if (selected && !selected.has(benchmark.name)) continue;
+
+    const { ms, min, max, result } = await timeRuns(() => benchmark.run(fixtures), runs);
+    const limit = thresholds[benchmark.name]?.[scale];
+    const status = limit === undefined ? 'no threshold' : ms <= limit ? 'ok' : 'REGRESSION';
+    if (status === 'REGRESSION') failures += 1;
+
+    console.log([
+      benchmark.name.padEnd(18),
+      `${ms.toFixed(1)} ms`.padStart(12),
+      (limit === undefined ? '' : `/ ${limit} ms`).padEnd(12),
+      status.padEnd(12),
+      (runs > 1 ? `range ${min.toFixed(1)}-${max.toFixed(1)} ms; ` : '') + result,
+    ].join(' '));
+  }
+
+  if (failures > 0) {
+    console.error(`${failures} benchmark(s) over threshold`);
+    process.exitCode = 1;
+  }
+};
+
+main();
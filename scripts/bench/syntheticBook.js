@@ -0,0 +1,255 @@
+// Deterministic synthetic books
+// Builds tenants, staff and investors, policies, multi-year ledgers, activity
+// logs and tax records in the shapes the API returns (and InvestmentApiService
+// / AdminApiService consume). The same seed always produces the same book, so
+// benchmark runs are comparable. Ledgers are generated page by page, so a
+// million-row ledger never has to be held in memory at once.
+
+const FIRST_NAMES = ['Adaeze', 'Babatunde', 'Chinedu', 'Damilola', 'Emeka', 'Funmilayo', 'Ibrahim', 'Kemi', 'Ngozi', 'Oluwaseun', 'Tunde', 'Yetunde', 'Zainab', 'Ifeanyi', 'Amaka', 'Segun'];
+const LAST_NAMES = ['Okafor', 'Adeyemi', 'Bello', 'Eze', 'Ogunleye', 'Nwosu', 'Abubakar', 'Okonkwo', 'Balogun', 'Uche', 'Danjuma', 'Afolabi', 'Obi', 'Lawal', 'Chukwu', 'Ayodele'];
+const BANKS = ['Access Bank', 'GTBank', 'First Bank', 'UBA', 'Zenith Bank', 'Fidelity Bank'];
+const ACTIONS = ['login', 'logout', 'policy_created', 'withdrawal_requested', 'withdrawal_approved', 'topup_added', 'profile_updated', 'statement_generated'];
+const ROI_RATE = '40.00';
+const DAY_MS = 24 * 60 * 60 * 1000;
+
+/**
+ * Seeded PRNG (mulberry32), returning floats in [0, 1)
+ */
+export const createRandom = (seed) => {
+  let state = seed >>> 0;
+  return () => {
+    state = (state + 0x6d2b79f5) >>> 0;
+    let t = state;
+    t = Math.imul(t ^ (t >>> 15), t | 1);
+    t ^= t + Math.imul(t ^ (t >>> 7), t | 61);
+    return ((t ^ (t >>> 14)) >>> 0) / 4294967296;
+  };
+};
+
+const pick = (random, values) => values[Math.floor(random() * values.length)];
+const money = (value) => value.toFixed(2);
+const isoDate = (time) => new Date(time).toISOString().slice(0, 10);
+const padId = (id) => id.toString().padStart(6, '0');
+
+/**
+ * Generate a book
+ * @param {object} options - { seed, tenants, policies, staff, years, endDate }
+ *   `policies` is the number of policies; investors hold one to three each
+ * @returns {object} - { tenants, users, policies, years, endDate, seed }
+ */
+export function generateBook(options = {}) {
+  const {
+    seed = 1,
+    tenants: tenantCount = 1,
+    policies: policyCount = 10000,
+    staff: staffCount = 20,
+    years = 2,
+    endDate = '2025-12-31',
+  } = options;
+
+  const random = createRandom(seed);
+  const end = Date.parse(endDate);
+  const start = end - years * 365 * DAY_MS;
+
+  const tenants = Array.from({ length: tenantCount }, (_, i) => ({
+    tenant_id: i + 1,
+    tenant_unique_id: `tenant-${i + 1}`,
+    tenant_schema: `tenant_${i + 1}`,
+    tenant_name: `${pick(random, LAST_NAMES)} Investments ${i + 1}`,
+  }));
+
+  const users = [];
+  const policies = [];
+  let userId = 0;
+
+  const addUser = (role, tenant) => {
+    userId += 1;
+    const firstName = pick(random, FIRST_NAMES);
+    const lastName = pick(random, LAST_NAMES);
+    const user = {
+      id: userId,
+      tenant_id: tenant.tenant_id,
+      email: `${firstName}.${lastName}.${userId}@example.com`.toLowerCase(),
+      first_name: firstName,
+      last_name: lastName,
+      role,
+      status: 'active',
+      date_joined: `${isoDate(start + random() * (end - start))}T09:00:00Z`,
+      profile: {
+        policy_number: `PRO-${padId(userId)}`,
+        personal_phone: `080${Math.floor(10000000 + random() * 89999999)}`,
+        gender: random() < 0.5 ? 'Male' : 'Female',
+        bank_name: pick(random, BANKS),
+        account_name: `${firstName} ${lastName}`,
+        account_number: Math.floor(1000000000 + random() * 8999999999).toString(),
+        kyc_status: random() < 0.8 ? 'Verified' : 'Pending',
+        roi_frequency: 'monthly',
+      },
+    };
+    users.push(user);
+    return user;
+  };
+
+  tenants.forEach(tenant => {
+    for (let i = 0; i < Math.ceil(staffCount / tenantCount); i++) addUser('staff', tenant);
+  });
+
+  while (policies.length < policyCount) {
+    const tenant = tenants[policies.length % tenantCount];
+    const investor = addUser('investor', tenant);
+    const held = Math.min(1 + Math.floor(random() * 3), policyCount - policies.length);
+
+    for (let p = 0; p < held; p++) {
+      const id = policies.length + 1;
+      const principal = Math.round(100000 + random() * 9900000);
+      const roiBalance = principal * 0.4 / 12 * Math.floor(random() * 12);
+      policies.push({
+        id,
+        tenant_id: tenant.tenant_id,
+        policy_number: `POL-${tenant.tenant_id}-${padId(id)}`,
+        user_details: {
+          id: investor.id,
+          email: investor.email,
+          first_name: investor.first_name,
+          last_name: investor.last_name,
+        },
+        principal_amount: money(principal),
+        current_balance: money(principal),
+        roi_balance: money(roiBalance),
+        total_balance: money(principal + roiBalance),
+        roi_rate: ROI_RATE,
+        roi_frequency: random() < 0.85 ? 'monthly' : 'on_demand',
+        start_date: isoDate(start + random() * (end - start - 30 * DAY_MS)),
+        status: 'active',
+      });
+    }
+  }
+
+  // A few prospective investors without policies
+  for (let i = 0; i < Math.ceil(policyCount / 50); i++) {
+    addUser('user', tenants[i % tenantCount]);
+  }
+
+  return { tenants, users, policies, years, endDate, seed };
+}
+
+/**
+ * Ledger entries for the book, one month of ROI per policy per month since its
+ * start date, plus the opening deposit, occasional top-ups and withdrawals
+ * @param {object} book - From generateBook
+ * @param {object} options - { pageSize, limit } where limit caps the total rows
+ * @returns {Generator<object[]>} - Pages of entries as /api/investments/ledger/ returns them
+ */
+export function* ledgerPages(book, { pageSize = 500, limit = Infinity } = {}) {
+  const end = Date.parse(book.endDate);
+  let page = [];
+  let produced = 0;
+  let entryId = 0;
+
+  const emit = function* (entry) {
+    page.push(entry);
+    produced += 1;
+    if (page.length === pageSize) {
+      yield page;
+      page = [];
+    }
+  };
+
+  for (const policy of book.policies) {
+    const random = createRandom(book.seed * 7919 + policy.id);
+    const rate = parseFloat(policy.roi_rate) / 12 / 100;
+    let principal = parseFloat(policy.principal_amount);
+    let roi = 0;
+    let date = Date.parse(policy.start_date);
+
+    const entry = (entryType, description, inflow, outflow) => {
+      entryId += 1;
+      return {
+        id: entryId,
+        policy: policy.id,
+        policy_number: policy.policy_number,
+        entry_date: isoDate(date),
+        description,
+        entry_type: entryType,
+        inflow: money(inflow),
+        outflow: money(outflow),
+        principal_balance: money(principal),
+        roi_balance: money(roi),
+        total_balance: money(principal + roi),
+      };
+    };
+
+    yield* emit(entry('deposit', 'Initial investment', principal, 0));
+
+    while (produced < limit) {
+      date += 30 * DAY_MS;
+      if (date > end) break;
+
+      const interest = principal * rate;
+      roi += interest;
+      yield* emit(entry('roi_accrual', 'Monthly ROI', interest, 0));
+
+      const event = random();
+      if (event < 0.05 && produced < limit) {
+        const amount = Math.round(50000 + random() * 950000);
+        principal += amount;
+        yield* emit(entry('top_up', 'Top-up', amount, 0));
+      } else if (event < 0.08 && roi > 0 && produced < limit) {
+        const amount = roi;
+        roi = 0;
+        yield* emit(entry('withdrawal', 'ROI withdrawal', 0, amount));
+      }
+    }
+    if (produced >= limit) break;
+  }
+
+  if (page.length > 0) yield page;
+}
+
+/**
+ * Activity log entries in the shape of /api/user/user-activities/
+ */
+export function generateActivities(book, count) {
+  const random = createRandom(book.seed * 104729);
+  const end = Date.parse(book.endDate);
+  return Array.from({ length: count }, (_, i) => {
+    const user = book.users[Math.floor(random() * book.users.length)];
+    return {
+      id: i + 1,
+      action: pick(random, ACTIONS),
+      user: { id: user.id, email: user.email },
+      user_email: user.email,
+      performed_by: null,
+      timestamp: new Date(end - random() * book.years * 365 * DAY_MS).toISOString(),
+      ip_address: `10.${Math.floor(random() * 255)}.${Math.floor(random() * 255)}.${Math.floor(random() * 255)}`,
+      success: random() < 0.97,
+      details: {},
+    };
+  });
+}
+
+/**
+ * Withholding tax records on ROI payments, one per policy per year
+ */
+export function generateTaxRecords(book) {
+  const endYear = new Date(book.endDate).getUTCFullYear();
+  const records = [];
+  book.policies.forEach(policy => {
+    const gross = parseFloat(policy.principal_amount) * parseFloat(policy.roi_rate) / 100;
+    for (let year = endYear - book.years + 1; year <= endYear; year++) {
+      records.push({
+        id: records.length + 1,
+        user_id: policy.user_details.id,
+        policy_number: policy.policy_number,
+        tax_type: 'WHT',
+        tax_year: year,
+        gross_amount: money(gross),
+        tax_amount: money(gross * 0.1),
+        net_amount: money(gross * 0.9),
+        calculation_date: `${year}-12-31`,
+        is_paid: year < endYear,
+      });
+    }
+  });
+  return records;
+}
@@ -1,6 +1,7 @@
 import React, { useState, useEffect } from 'react';
 import { useAuth } from '../../contexts/AuthContext';
-import useAdminApi from '../services/AdminApiService';
+import useAdminApi, { ACTIVITY_DASHBOARD_POLL_MS } from '../services/AdminApiService';
+import { subscribe } from '../../services/eventHub';
 import StatsGrid from './StatsGrid';
 import ActivityCharts from './ActivityCharts';
 import SecurityOverview from './SecurityOverview';
@@ -45,11 +46,26 @@ const ActivityDashboard = () => {
   };
 
   useEffect(() => {
-    loadDashboard();
-
-    const interval = setInterval(loadDashboard, 30000); // Poll every 30 seconds for real-time updates
+    setLoading(true);
+    setError(null);
 
-    return () => clearInterval(interval);
+    // Shared poller; only re-renders when the dashboard data actually changed
+    return subscribe(
+      `activity-dashboard:${timeRange}`,
+      { poll: () => fetchActivityDashboard(timeRange), intervalMs: ACTIVITY_DASHBOARD_POLL_MS },
+      (events) => {
+        setDashboardData(events[events.length - 1]);
+        setError(null);
+        setLoading(false);
+      },
+      {
+        onError: (err) => {
+          console.error('❌ Failed to load dashboard data:', err);
+          setError(err.message || 'Failed to load dashboard data. Please try again.');
+          setLoading(false);
+        },
+      }
+    );
   }, [timeRange, fetchActivityDashboard]);
 
   const handleRetry = () => {
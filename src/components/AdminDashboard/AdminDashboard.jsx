@@ -1,7 +1,8 @@
 // src/components/AdminDashboard/AdminDashboard.jsx
 import React, { useState, useEffect } from 'react';
 import { useAuth } from '../../contexts/AuthContext';
-import useAdminApi from '../services/AdminApiService';
+import useAdminApi, { ACTIVITY_DASHBOARD_POLL_MS } from '../services/AdminApiService';
+import { subscribe } from '../../services/eventHub';
 import InvestmentTable from './InvestmentTable';
 import TransactionModal from './TransactionModal';
 import TransactionForm from './TransactionForm';
@@ -25,6 +26,7 @@ import Loader from '../Loader';
 import './AdminDashboard.css';
 import WithdrawalManagement from './WithdrawalManagement';
 import { calculateWHT, calculateInvestmentTaxes, formatCurrency } from '../../utils/nigerianTaxCalculator';
+import { sumAmounts } from '../../utils/money';
 
 
 const AdminDashboard = () => {
@@ -110,38 +112,32 @@ const AdminDashboard = () => {
   }, [isAuthenticated, fetchUsers, refreshTrigger]);
 
   // Load activities for the sidebar ActivityLog
+  // Shares one poller with ActivityDashboard and only updates on change
   useEffect(() => {
-    let mounted = true;
-    const loadActivities = async () => {
-      if (!isAuthenticated) {
-        if (mounted) {
-          setActivities([]);
-          setActivitiesLoading(false);
-        }
-        return;
-      }
+    if (!isAuthenticated) {
+      setActivities([]);
+      setActivitiesLoading(false);
+      return;
+    }
 
-      setActivitiesLoading(true);
-      try {
-        const data = await fetchActivityDashboard('7d');
-        if (!mounted) return;
+    setActivitiesLoading(true);
+    return subscribe(
+      'activity-dashboard:7d',
+      { poll: () => fetchActivityDashboard('7d'), intervalMs: ACTIVITY_DASHBOARD_POLL_MS },
+      (events) => {
+        const data = events[events.length - 1];
         // API returns either { results: [...] } or an array — normalize to array of items
         const items = data?.activities || data?.results || data || [];
         setActivities(Array.isArray(items) ? items : []);
-      } catch (err) {
-        console.error('Error loading activities for sidebar:', err);
-        if (mounted) setActivities([]);
-      } finally {
-        if (mounted) setActivitiesLoading(false);
+        setActivitiesLoading(false);
+      },
+      {
+        onError: (err) => {
+          console.error('Error loading activities for sidebar:', err);
+          setActivitiesLoading(false);
+        },
       }
-    };
-
-    loadActivities();
-    const interval = setInterval(loadActivities, 30000);
-    return () => {
-      mounted = false;
-      clearInterval(interval);
-    };
+    );
   }, [isAuthenticated, fetchActivityDashboard]);
 
   // Fetch dashboard metrics
@@ -590,12 +586,12 @@ const AdminDashboard = () => {
                     <div className="stat-card clickable" onClick={() => setActiveSection('Investors')} title="View Policy Amount">
                       <span className="material-icons" style={{ fontSize: '1.2rem' }}>account_balance</span>
                       <h3 style={{ fontSize: '0.7rem', margin: '0.5rem 0' }}>POLICY AMOUNT</h3>
-                      <p style={{ fontSize: '0.8rem', textAlign: 'center', margin: '0' }}>₦{formatNumber(dashboardMetrics?.metrics?.total_policy_amount || investors.reduce((sum, inv) => sum + (inv.investmentAmount || 0), 0))}</p>
+                      <p style={{ fontSize: '0.8rem', textAlign: 'center', margin: '0' }}>₦{formatNumber(dashboardMetrics?.metrics?.total_policy_amount || sumAmounts(investors.map((inv) => inv.investmentAmount)))}</p>
                     </div>
                     <div className="stat-card clickable" onClick={() => setActiveSection('Statements')} title="View ROI Policy">
                       <span className="material-icons" style={{ fontSize: '1.2rem' }}>trending_up</span>
                       <h3 style={{ fontSize: '0.7rem', margin: '0.5rem 0' }}>ROI POLICY</h3>
-                      <p style={{ fontSize: '0.8rem', textAlign: 'center', margin: '0' }}>₦{formatNumber(dashboardMetrics?.metrics?.monthly_roi_liability || investors.reduce((sum, inv) => sum + (inv.roiDue || 0), 0))}</p>
+                      <p style={{ fontSize: '0.8rem', textAlign: 'center', margin: '0' }}>₦{formatNumber(dashboardMetrics?.metrics?.monthly_roi_liability || sumAmounts(investors.map((inv) => inv.roiDue)))}</p>
                     </div>
                     <div className="stat-card clickable" onClick={() => setActiveSection('Staff')} title="View Staff">
                       <span className="material-icons" style={{ fontSize: '1.2rem' }}>group</span>
@@ -1,7 +1,9 @@
-import React, { useState, useRef, useEffect } from 'react';
+import React, { useState, useRef, useEffect, useMemo } from 'react';
 import './InvestmentTable.css';
 import MessageModal from '../MessageModal';
 import ConfirmModal from '../ConfirmModal';
+import { SearchIndex } from '../../utils/searchIndex';
+import { sumAmounts } from '../../utils/money';
 
 
 // Helper function to format date as DD MMM YYYY (e.g., 21 Sep 2025)
@@ -21,7 +23,7 @@ const getMonthName = (dateString) => {
 
 const InvestmentTable = ({ investors, onVerifyKYC, onRecordTransaction, onInvestorNameClick, onDelete, onEditPolicy, onTaxReport }) => {
     // Map API data to table fields
-    const mappedInvestors = investors.map(inv => {
+    const mappedInvestors = useMemo(() => investors.map(inv => {
       // Support both flat and nested API structures
       const user = inv.user_details || inv.userDetails || {};
       const investmentDetail = (user.investment_details && user.investment_details[0]) || (user.investmentDetails && user.investmentDetails[0]) || {};
@@ -65,7 +67,7 @@ const InvestmentTable = ({ investors, onVerifyKYC, onRecordTransaction, onInvest
         policies: inv.policies || [],
         ...invWithoutRoiDue,
       };
-    });
+    }), [investors]);
   const [searchTerm, setSearchTerm] = useState('');
   const [monthFilter, setMonthFilter] = useState('All Months');
   const [statusFilter, setStatusFilter] = useState('All Statuses');
@@ -78,20 +80,38 @@ const InvestmentTable = ({ investors, onVerifyKYC, onRecordTransaction, onInvest
   const menuRef = useRef();
   const [dropdownUp, setDropdownUp] = useState(false);
   const btnRefs = useRef({});
+  const searchIndexRef = useRef(null);
 
+  // Keep the search index in step with the investors list; only rows whose
+  // searchable values changed are re-indexed
+  const searchIndex = useMemo(() => {
+    if (!searchIndexRef.current) searchIndexRef.current = new SearchIndex();
+    searchIndexRef.current.sync(
+      mappedInvestors,
+      row => row.id,
+      row => [row.name, row.uniquePolicy, row.email, row.phoneNumber, row.accountNumber]
+    );
+    return searchIndexRef.current;
+  }, [mappedInvestors]);
+
+  // Rank of each matching investor, best match first
+  const searchRanks = useMemo(() => {
+    if (!searchTerm) return null;
+    return new Map(searchIndex.search(searchTerm).ids.map((id, rank) => [id, rank]));
+  }, [mappedInvestors, searchIndex, searchTerm]);
 
   const uniqueMonths = ['All Months', ...new Set(mappedInvestors.map(inv => getMonthName(inv.date)).filter(Boolean))];
   const uniqueStatuses = ['All Statuses', ...new Set(mappedInvestors.map(inv => inv.status || 'Active'))];
 
   const filteredInvestors = mappedInvestors.filter(inv => {
-    const matchesSearch = (
-      inv.name.toLowerCase().includes(searchTerm.toLowerCase()) ||
-      (inv.uniquePolicy && inv.uniquePolicy.toLowerCase().includes(searchTerm.toLowerCase()))
-    );
+    const matchesSearch = !searchRanks || searchRanks.has(inv.id);
     const matchesMonth = monthFilter === 'All Months' || getMonthName(inv.date) === monthFilter;
     const matchesStatus = statusFilter === 'All Statuses' || (inv.status || 'Active') === statusFilter;
     return matchesSearch && matchesMonth && matchesStatus;
   });
+  if (searchRanks) {
+    filteredInvestors.sort((a, b) => searchRanks.get(a.id) - searchRanks.get(b.id));
+  }
 
   const totalPages = Math.ceil(filteredInvestors.length / pageSize);
   const paginatedInvestors = filteredInvestors.slice(
@@ -299,7 +319,7 @@ const InvestmentTable = ({ investors, onVerifyKYC, onRecordTransaction, onInvest
                   </td>
                   <td data-label="Withdrawals (₦)">
                     ₦{Array.isArray(investor.withdrawals)
-                      ? investor.withdrawals.reduce((sum, w) => sum + (parseFloat(w.amount) || 0), 0).toLocaleString()
+                      ? sumAmounts(investor.withdrawals.map((w) => w.amount)).toLocaleString()
                       : 0}
                   </td>
                   <td data-label="Status">
@@ -1,5 +1,6 @@
-import React, { useState } from 'react';
+import React, { useState, useRef } from 'react';
 import './KYCVerificationModal.css';
+import { prepareImageUpload } from '../../utils/imageUpload';
 
 const KYCVerificationModal = ({ investor, onClose, onSubmit }) => {
   const [kycData, setKycData] = useState({
@@ -9,6 +10,7 @@ const KYCVerificationModal = ({ investor, onClose, onSubmit }) => {
   });
   const [errors, setErrors] = useState({});
   const [isSubmitting, setIsSubmitting] = useState(false);
+  const selectedFilesRef = useRef({});
 
   const validate = () => {
     const newErrors = {};
@@ -32,10 +34,27 @@ const KYCVerificationModal = ({ investor, onClose, onSubmit }) => {
 
   const handleChange = (e) => {
     const { name, value, files } = e.target;
-    setKycData(prev => ({ ...prev, [name]: files ? files[0] : value }));
+    if (files) {
+      handleFileChange(name, files[0]);
+      return;
+    }
+    setKycData(prev => ({ ...prev, [name]: value }));
     setErrors(prev => ({ ...prev, [name]: '' }));
   };
 
+  // Downscale ID scans in the browser so the upload stays small. The original
+  // file is used until the smaller one is ready, and a resize that finishes
+  // after another file was picked is discarded.
+  const handleFileChange = async (name, file) => {
+    selectedFilesRef.current[name] = file;
+    setKycData(prev => ({ ...prev, [name]: file }));
+    setErrors(prev => ({ ...prev, [name]: '' }));
+
+    const upload = await prepareImageUpload(file);
+    if (upload === file || selectedFilesRef.current[name] !== file) return;
+    setKycData(prev => ({ ...prev, [name]: upload }));
+  };
+
   const handleSubmit = async (status) => {
     if (!validate()) return;
     setIsSubmitting(true);
@@ -1,6 +1,7 @@
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, useMemo, useSyncExternalStore } from 'react';
 import './InvestmentTable.css';
 import MessageModal from '../MessageModal';
+import { roiDueIndex } from '../../utils/roiDueIndex';
 
 // Helper function to format date as DD MMM YYYY (e.g., 21 Sep 2025)
 const formatDate = (dateString) => {
@@ -17,6 +18,9 @@ const getMonthName = (dateString) => {
   return date.toLocaleString('en-GB', { month: 'long' });
 };
 
+const subscribeToDueIndex = listener => roiDueIndex.subscribe(listener);
+const getDueIndexVersion = () => roiDueIndex.version;
+
 const ROIPolicyTable = ({ investors, onInvestorNameClick }) => {
   // Search and filter states
   const [searchTerm, setSearchTerm] = useState('');
@@ -34,6 +38,16 @@ const ROIPolicyTable = ({ investors, onInvestorNameClick }) => {
   // Get unique months for dropdown
   const uniqueMonths = ['All Months', ...new Set(investors.map(inv => getMonthName(inv.roiDueDate)).filter(Boolean))];
 
+  // Policies overdue or due within 7 days, read from the due-date index
+  // (refilled whenever the investor list is fetched, and updated in place when
+  // a policy changes, which re-renders this table through the subscription)
+  const dueIndexVersion = useSyncExternalStore(subscribeToDueIndex, getDueIndexVersion);
+  const dueSoonPolicyIds = useMemo(() => new Set(
+    roiDueIndex
+      .dueBetween('0000-01-01', new Date(Date.now() + 7 * 24 * 60 * 60 * 1000))
+      .map(policy => policy.id)
+  ), [dueIndexVersion]);
+
   // Filtered investors
   const filteredInvestors = investors.filter(inv => {
     // Only include investors with ROI due
@@ -48,14 +62,10 @@ const ROIPolicyTable = ({ investors, onInvestorNameClick }) => {
 
     const matchesMonth = monthFilter === 'All Months' || getMonthName(inv.roiDueDate) === monthFilter;
 
-    const now = new Date(); // Use current date dynamically
-    const dueDate = inv.roiDueDate ? new Date(inv.roiDueDate) : null;
     const matchesRoiDue = roiDueFilter === 'All' ||
       (roiDueFilter === 'Monthly' && inv.roiFrequency === 'Monthly' && matchesMonth) ||
-      (roiDueFilter === 'As at When Due' && dueDate && (
-        dueDate <= now || // Overdue
-        (dueDate > now && (dueDate - now) / (1000 * 60 * 60 * 24) <= 7) // Due within 7 days
-      ));
+      // Rows show the primary policy's due date, so match on that policy
+      (roiDueFilter === 'As at When Due' && dueSoonPolicyIds.has(inv.policies?.[0]?.id));
 
     return matchesSearch && matchesMonth && matchesRoiDue;
   });
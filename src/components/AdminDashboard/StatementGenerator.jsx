@@ -1,14 +1,17 @@
 // src/components/AdminDashboard/StatementGenerator.jsx
-import React, { useRef, useState, useEffect } from 'react';
+import React, { useRef, useState, useEffect, useMemo } from 'react';
 import { useReactToPrint } from 'react-to-print';
 import * as XLSX from 'xlsx';
 import useInvestmentApi from '../../services/InvestmentApiService';
 import { useAuth } from '../../contexts/AuthContext';
+import { SearchIndex } from '../../utils/searchIndex';
+import { runBatchJob, clearBatchJob, listBatchJobs, expireBatchJobs } from '../../utils/batchJob';
+import { downloadBlob } from '../../utils/ledgerExport';
 import './StatementGenerator.css';
 
 const StatementGenerator = ({ investors }) => {
   const { tenantData } = useAuth();
-  const { generateStatement, getPolicies } = useInvestmentApi();
+  const { generateStatement, getPolicies, exportLedgerCsv, verifyLedgerSummary } = useInvestmentApi();
   
   const [company, setCompany] = useState({
     name: tenantData?.tenant_name || 'Investment Company',
@@ -23,11 +26,15 @@ const StatementGenerator = ({ investors }) => {
   const [customEndDate, setCustomEndDate] = useState('');
   const [statementData, setStatementData] = useState(null);
   const [loading, setLoading] = useState(false);
+  const [bulkProgress, setBulkProgress] = useState(null);
+  const [ledgerExportRows, setLedgerExportRows] = useState(null);
+  const [verifyingLedger, setVerifyingLedger] = useState(false);
   const [modal, setModal] = useState({ show: false, message: '', type: '' });
   const [currentPage, setCurrentPage] = useState(1);
   const pageSize = 5;
 
   const componentRef = useRef();
+  const searchIndexRef = useRef(null);
 
   // Update company info from tenant
   useEffect(() => {
@@ -39,11 +46,23 @@ const StatementGenerator = ({ investors }) => {
     }
   }, [tenantData]);
 
-  // Filtered investors
-  const filteredInvestors = investors.filter(inv =>
-    inv.name.toLowerCase().includes(searchTerm.toLowerCase()) ||
-    inv.uniquePolicy?.toLowerCase().includes(searchTerm.toLowerCase())
-  );
+  // Search index over investors, updated only for records that changed
+  const searchIndex = useMemo(() => {
+    if (!searchIndexRef.current) searchIndexRef.current = new SearchIndex();
+    searchIndexRef.current.sync(
+      investors,
+      inv => inv.id,
+      inv => [inv.name, inv.uniquePolicy, inv.email, inv.phoneNumber, inv.accountNumber]
+    );
+    return searchIndexRef.current;
+  }, [investors]);
+
+  // Filtered investors, best match first
+  const filteredInvestors = useMemo(() => {
+    if (!searchTerm) return investors;
+    const byId = new Map(investors.map(inv => [inv.id, inv]));
+    return searchIndex.search(searchTerm).ids.map(id => byId.get(id));
+  }, [investors, searchIndex, searchTerm]);
 
   // Pagination
   const totalPages = Math.ceil(filteredInvestors.length / pageSize);
@@ -79,24 +98,32 @@ const StatementGenerator = ({ investors }) => {
     await generateStatementForPolicy(investor, investor.policies[0].id);
   };
 
+  // Request body for the selected period, or for explicit dates
+  const statementRequest = (policyId, period = null) => {
+    if (period) {
+      return { policy_id: policyId, duration: 'custom', start_date: period.start, end_date: period.end };
+    }
+    const requestData = {
+      policy_id: policyId,
+      duration: duration,
+    };
+    if (duration === 'custom') {
+      requestData.start_date = customStartDate;
+      requestData.end_date = customEndDate;
+    }
+    return requestData;
+  };
+
   const generateStatementForPolicy = async (investor, policyId) => {
     setLoading(true);
     try {
-      const requestData = {
-        policy_id: policyId,
-        duration: duration,
-      };
-
-      if (duration === 'custom') {
-        if (!customStartDate || !customEndDate) {
-          showModal('Please select both start and end dates for custom range', 'error');
-          setLoading(false);
-          return;
-        }
-        requestData.start_date = customStartDate;
-        requestData.end_date = customEndDate;
+      if (duration === 'custom' && (!customStartDate || !customEndDate)) {
+        showModal('Please select both start and end dates for custom range', 'error');
+        setLoading(false);
+        return;
       }
 
+      const requestData = statementRequest(policyId);
       const result = await generateStatement(requestData);
       
       if (result.success) {
@@ -113,6 +140,116 @@ const StatementGenerator = ({ investors }) => {
     }
   };
 
+  // Generate statements for every policy of every investor into one workbook.
+  // Finished statements are checkpointed per period, so running this again
+  // after a crash or a partial failure only requests the missing ones. Preset
+  // durations are resolved to dates when a run starts, and an unfinished run
+  // resumes with those dates even if the day has changed since.
+  const handleBulkGenerate = async () => {
+    if (duration === 'custom' && (!customStartDate || !customEndDate)) {
+      showModal('Please select both start and end dates for custom range', 'error');
+      return;
+    }
+
+    const items = investors.flatMap(investor =>
+      (investor.policies || []).map(policy => ({ investor, policy }))
+    );
+    if (items.length === 0) {
+      showModal('No policies found', 'error');
+      return;
+    }
+
+    const tenant = tenantData?.tenant_id || 'default';
+
+    setBulkProgress({ done: 0, total: items.length });
+    try {
+      await expireBatchJobs(BULK_JOB_MAX_AGE_MS);
+
+      let period;
+      if (duration === 'custom') {
+        period = { start: customStartDate, end: customEndDate };
+      } else {
+        const unfinished = await listBatchJobs(`statements:${tenant}:${duration}:`);
+        period = unfinished.length > 0
+          ? parsePeriod(unfinished[unfinished.length - 1].split(':').pop())
+          : resolvePeriod(duration);
+      }
+      const periodLabel = `${period.start}_${period.end}`;
+      const jobKey = `statements:${tenant}:${duration}:${periodLabel}`;
+
+      const { results, failed } = await runBatchJob({
+        jobKey,
+        name: 'statements',
+        items,
+        getKey: ({ policy }) => policy.id,
+        run: async ({ policy }) => {
+          const result = await generateStatement(statementRequest(policy.id, period));
+          if (!result.success) throw new Error(result.error || 'Failed to generate statement');
+          return result.data;
+        },
+        concurrency: BULK_STATEMENT_CONCURRENCY,
+        onProgress: (done, total) => setBulkProgress({ done, total }),
+      });
+
+      if (results.size > 0) {
+        writeStatementArchive([...results.values()], `${company.name}_statements_${periodLabel}.xlsx`);
+      }
+
+      if (failed.length === 0) {
+        await clearBatchJob(jobKey);
+        showModal(`${results.size} statements generated successfully!`, 'success');
+      } else {
+        console.error('Failed statements:', failed);
+        showModal(`${failed.length} of ${items.length} statements failed. Run again to retry them.`, 'error');
+      }
+    } catch (error) {
+      console.error('Bulk statement error:', error);
+      showModal('Error generating statements', 'error');
+    } finally {
+      setBulkProgress(null);
+    }
+  };
+
+  // Download the whole ledger as CSV; pages are written out as they arrive,
+  // so this works however many entries the ledger holds
+  const handleLedgerExport = async () => {
+    setLedgerExportRows(0);
+    try {
+      const blob = await exportLedgerCsv({}, setLedgerExportRows);
+      if (!blob) {
+        showModal('Ledger export failed', 'error');
+        return;
+      }
+      downloadBlob(blob, `${company.name}_ledger_${new Date().toISOString().slice(0, 10)}.csv`);
+      showModal('Ledger exported successfully!', 'success');
+    } finally {
+      setLedgerExportRows(null);
+    }
+  };
+
+  // Recompute the ledger totals from every entry and compare them with the
+  // stored summary, per-policy and monthly reports
+  const handleLedgerVerify = async () => {
+    setVerifyingLedger(true);
+    try {
+      const result = await verifyLedgerSummary();
+      if (!result) {
+        showModal('Ledger verification failed', 'error');
+      } else if (result.ok) {
+        showModal('Ledger totals match the stored reports', 'success');
+      } else {
+        console.warn('Ledger mismatches:', result.mismatches);
+        const [first] = result.mismatches;
+        showModal(
+          `${result.mismatches.length} ledger mismatch(es), e.g. ${first.scope}${first.key ? ` ${first.key}` : ''} ${first.field}: expected ${first.expected}, got ${first.actual}`,
+          'error'
+        );
+      }
+    } finally {
+      setVerifyingLedger(false);
+    }
+  };
+
   // Print statement
   const handlePrint = useReactToPrint({
     content: () => componentRef.current,
@@ -162,17 +299,6 @@ const StatementGenerator = ({ investors }) => {
         'Total Balance (₦)'
       ];
 
-      const dataRows = entries.map(entry => [
-        formatDate(entry.entry_date),
-        entry.description,
-        entry.entry_type,
-        parseFloat(entry.inflow || 0).toLocaleString(),
-        parseFloat(entry.outflow || 0).toLocaleString(),
-        parseFloat(entry.principal_balance || 0).toLocaleString(),
-        parseFloat(entry.roi_balance || 0).toLocaleString(),
-        parseFloat(entry.total_balance || 0).toLocaleString(),
-      ]);
-
       const summaryRows = [
         [],
         ['Summary'],
@@ -187,7 +313,7 @@ const StatementGenerator = ({ investors }) => {
         headerRow,
         ...policyInfoRows,
         tableHeader,
-        ...dataRows,
+        ...entries.map(statementEntryRow),
         ...summaryRows
       ];
 
@@ -261,6 +387,34 @@ const StatementGenerator = ({ investors }) => {
             />
           </>
         )}
+
+        <button
+          onClick={handleBulkGenerate}
+          className="action-btn"
+          disabled={bulkProgress !== null || loading}
+        >
+          {bulkProgress
+            ? `Generating ${bulkProgress.done}/${bulkProgress.total}...`
+            : 'Generate All Statements'}
+        </button>
+
+        <button
+          onClick={handleLedgerExport}
+          className="action-btn"
+          disabled={ledgerExportRows !== null}
+        >
+          {ledgerExportRows !== null
+            ? `Exporting ${ledgerExportRows.toLocaleString()} rows...`
+            : 'Export Ledger CSV'}
+        </button>
+
+        <button
+          onClick={handleLedgerVerify}
+          className="action-btn"
+          disabled={verifyingLedger}
+        >
+          {verifyingLedger ? 'Verifying Ledger...' : 'Verify Ledger Totals'}
+        </button>
       </div>
 
       {/* Policy Selection Modal */}
@@ -417,6 +571,83 @@ const StatementGenerator = ({ investors }) => {
   );
 };
 
+// Statement requests in flight during a bulk run
+const BULK_STATEMENT_CONCURRENCY = 4;
+
+// Checkpoints of bulk runs not finished within this long are discarded
+const BULK_JOB_MAX_AGE_MS = 7 * 24 * 60 * 60 * 1000;
+
+const PERIOD_MONTHS = { '1_month': 1, '3_months': 3, '6_months': 6, '1_year': 12 };
+
+// Dates covered by a preset duration, ending today
+const resolvePeriod = (duration) => {
+  const end = new Date();
+  const start = new Date(end);
+  start.setMonth(start.getMonth() - PERIOD_MONTHS[duration]);
+  return { start: start.toISOString().slice(0, 10), end: end.toISOString().slice(0, 10) };
+};
+
+const parsePeriod = (label) => {
+  const [start, end] = label.split('_');
+  return { start, end };
+};
+
+const statementEntryRow = entry => [
+  formatDate(entry.entry_date),
+  entry.description,
+  entry.entry_type,
+  parseFloat(entry.inflow || 0).toLocaleString(),
+  parseFloat(entry.outflow || 0).toLocaleString(),
+  parseFloat(entry.principal_balance || 0).toLocaleString(),
+  parseFloat(entry.roi_balance || 0).toLocaleString(),
+  parseFloat(entry.total_balance || 0).toLocaleString(),
+];
+
+// Write many statements to one workbook: a summary row per policy plus every
+// ledger entry tagged with its policy number
+const writeStatementArchive = (statements, fileName) => {
+  const summarySheet = XLSX.utils.aoa_to_sheet([[
+    'Policy Number',
+    'Investor',
+    'Period',
+    'Start Balance (₦)',
+    'End Balance (₦)',
+    'Total Inflow (₦)',
+    'Total Outflow (₦)',
+    'Net Flow (₦)',
+  ]]);
+  XLSX.utils.sheet_add_aoa(summarySheet, statements.map(({ policy_details, summary, statement_period }) => [
+    policy_details.policy_number,
+    policy_details.investor_name,
+    statement_period,
+    parseFloat(policy_details.start_balance || 0),
+    parseFloat(policy_details.end_balance || 0),
+    parseFloat(summary.total_inflow || 0),
+    parseFloat(summary.total_outflow || 0),
+    parseFloat(summary.net_flow || 0),
+  ]), { origin: -1 });
+
+  const entriesSheet = XLSX.utils.aoa_to_sheet([[
+    'Policy Number',
+    'Date',
+    'Description',
+    'Type',
+    'Inflow (₦)',
+    'Outflow (₦)',
+    'Principal Balance (₦)',
+    'ROI Balance (₦)',
+    'Total Balance (₦)',
+  ]]);
+  XLSX.utils.sheet_add_aoa(entriesSheet, statements.flatMap(({ policy_details, entries }) =>
+    entries.map(entry => [policy_details.policy_number, ...statementEntryRow(entry)])
+  ), { origin: -1 });
+
+  const wb = XLSX.utils.book_new();
+  XLSX.utils.book_append_sheet(wb, summarySheet, 'Summary');
+  XLSX.utils.book_append_sheet(wb, entriesSheet, 'Entries');
+  XLSX.writeFile(wb, fileName);
+};
+
 // Helper function
 const formatDate = (dateString) => {
   if (!dateString) return 'N/A';
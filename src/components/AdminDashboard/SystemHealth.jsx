@@ -1,6 +1,31 @@
-import React from 'react';
+import React, { useState, useEffect } from 'react';
+import { subscribe } from '../../services/eventHub';
+import { getMetricsSnapshot } from '../../services/metrics';
+import { getAuditMetrics } from '../../services/auditTrail';
+
+// Slowest endpoints and stages shown
+const CLIENT_METRICS_ROWS = 8;
+
+const formatMs = (ms) => (ms >= 1000 ? `${(ms / 1000).toFixed(2)}s` : `${ms.toFixed(1)}ms`);
 
 const SystemHealth = ({ healthData }) => {
+  const [clientMetrics, setClientMetrics] = useState(null);
+  const [auditMetrics, setAuditMetrics] = useState(null);
+
+  // Latency histograms recorded in this tab, re-read while mounted
+  useEffect(() => subscribe(
+    'client-metrics',
+    { poll: async () => getMetricsSnapshot(), intervalMs: 10000 },
+    (events) => setClientMetrics(events[events.length - 1])
+  ), []);
+
+  // Audit writer queue and flush latency, plus a check of the queued chain
+  useEffect(() => subscribe(
+    'audit-metrics',
+    { poll: getAuditMetrics, intervalMs: 10000 },
+    (events) => setAuditMetrics(events[events.length - 1])
+  ), []);
+
   if (!healthData) return null;
 
   const getStatusIcon = (status) => {
@@ -73,6 +98,69 @@ const SystemHealth = ({ healthData }) => {
             <span className="metric-value">{healthData.metrics.activity_trend}</span>
           </div>
         </div>
+
+        {clientMetrics?.latencies.length > 0 && (
+          <div className="client-metrics">
+            <h4>Slowest Requests &amp; Stages (this session)</h4>
+            <table>
+              <thead>
+                <tr>
+                  <th>Endpoint / Stage</th>
+                  <th>Count</th>
+                  <th>p50</th>
+                  <th>p95</th>
+                  <th>p99</th>
+                  <th>Queries / Req</th>
+                </tr>
+              </thead>
+              <tbody>
+                {clientMetrics.latencies.slice(0, CLIENT_METRICS_ROWS).map(row => {
+                  const queries = clientMetrics.counters[`db_queries ${row.name.replace(/^api /, '')}`];
+                  return (
+                    <tr key={row.name}>
+                      <td>{row.name}</td>
+                      <td>{row.count}</td>
+                      <td>{formatMs(row.p50)}</td>
+                      <td>{formatMs(row.p95)}</td>
+                      <td>{formatMs(row.p99)}</td>
+                      <td>{queries !== undefined ? (queries / row.count).toFixed(1) : 'N/A'}</td>
+                    </tr>
+                  );
+                })}
+              </tbody>
+            </table>
+          </div>
+        )}
+
+        {auditMetrics?.enabled && (
+          <div className="client-metrics">
+            <h4>Audit Trail Writer</h4>
+            <table>
+              <thead>
+                <tr>
+                  <th>Status</th>
+                  <th>Queued</th>
+                  <th>Not Queued</th>
+                  <th>Written</th>
+                  <th>Avg Flush</th>
+                  <th>Max Flush</th>
+                </tr>
+              </thead>
+              <tbody>
+                <tr>
+                  <td style={{ color: auditMetrics.stopped || !auditMetrics.queueIntact ? '#dc3545' : '#00a86b' }}>
+                    {auditMetrics.stopped ? 'Stopped' : auditMetrics.queueIntact ? 'Running' : 'Queue chain broken'}
+                  </td>
+                  <td>{auditMetrics.queueDepth}</td>
+                  <td style={{ color: auditMetrics.omitted > 0 ? '#dc3545' : undefined }}>{auditMetrics.omitted}</td>
+                  <td>{auditMetrics.entriesWritten}</td>
+                  <td>{formatMs(auditMetrics.avgFlushMs)}</td>
+                  <td>{formatMs(auditMetrics.maxFlushMs)}</td>
+                </tr>
+              </tbody>
+            </table>
+          </div>
+        )}
       </div>
     </div>
   );
@@ -1,5 +1,6 @@
 import React, { useContext, useEffect } from 'react';
 import { NotificationContext } from './UserDashboard';
+import { subscribe } from '../../services/eventHub';
 import './NotificationHandler.css';
 
 // Mock notification data
@@ -74,13 +75,15 @@ const NotificationHandler = () => {
       });
     }
 
-    // Simulate real-time updates with periodic fetch (every 30 seconds)
-    const interval = setInterval(() => {
-      mockFetchNotifications().then(data => {
+    // Real-time updates: the event hub only hands over notifications it has
+    // not seen before, so there is no need to diff the whole list here
+    return subscribe(
+      'notifications',
+      { poll: mockFetchNotifications, getKey: notif => notif.id, intervalMs: 30000 },
+      (incoming) => {
         setNotifications(prev => {
-          const newNotifications = data.filter(
-            newNotif => !prev.some(prevNotif => prevNotif.id === newNotif.id)
-          );
+          const knownIds = new Set(prev.map(notif => notif.id));
+          const newNotifications = incoming.filter(notif => !knownIds.has(notif.id));
           if (newNotifications.length > 0) {
             const updatedNotifications = [...prev, ...newNotifications];
             localStorage.setItem('notifications', JSON.stringify(updatedNotifications));
@@ -88,10 +91,8 @@ const NotificationHandler = () => {
           }
           return prev;
         });
-      });
-    }, 30000);
-
-    return () => clearInterval(interval);
+      }
+    );
   }, [setNotifications]);
 
   const handleMarkAsRead = (id) => {
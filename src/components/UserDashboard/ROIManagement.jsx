@@ -2,6 +2,7 @@ import React, { useState, useEffect } from 'react';
 import './ROIManagement.css';
 import useInvestmentApi from '../../services/InvestmentApiService';
 import { useAuth } from '../../contexts/AuthContext';
+import { sumAmounts } from '../../utils/money';
 
 const ROIManagement = () => {
   const { user } = useAuth();
@@ -248,7 +249,7 @@ const ROIManagement = () => {
                 <div className="stat-content">
                   <span className="stat-label">Total ROI Balance</span>
                   <span className="stat-value">
-                    ₦{policies.reduce((sum, p) => sum + (p.roi_balance || 0), 0).toLocaleString()}
+                    ₦{sumAmounts(policies.map((p) => p.roi_balance)).toLocaleString()}
                   </span>
                 </div>
               </div>
@@ -1,6 +1,40 @@
 // src/components/services/AdminApiService.jsx
-import { useAuth } from '../../contexts/AuthContext';
+import { useAuth, onSignOut } from '../../contexts/AuthContext';
 import { useCallback } from 'react';
+import { roiDueIndex } from '../../utils/roiDueIndex';
+import { buildDirectory } from '../../utils/directory';
+import { timeStage } from '../../services/metrics';
+
+// Page size requested when listing policies for the investor directory
+const DIRECTORY_PAGE_SIZE = 500;
+
+// Last response body per page, keyed for ETag revalidation and grouped by the
+// paginated list the page belongs to. A walk over a list keeps every page it
+// saw and drops the rest, so the cache is sized to the list however many pages
+// it has; a fixed page cap would evict each page of a large directory before
+// the next walk reached it. Cached bodies hold the same row objects the walk
+// returns, so the extra memory is the page wrappers, not a second copy.
+// Least recently walked lists are evicted past ETAG_CACHE_MAX_LISTS.
+const ETAG_CACHE_MAX_LISTS = 4;
+const etagCache = new Map();  // list URL -> Map(page URL -> { etag, data })
+
+// How often the dashboards poll the activity endpoints
+export const ACTIVITY_DASHBOARD_POLL_MS = 30000;
+
+// Composite activity dashboard per window (days). Entries hold the in-flight
+// request too, so concurrent callers share one set of requests. The TTL is one
+// poll interval: a poll always finds the previous result expired and fetches,
+// while remounting a dashboard or flipping back to a recent time range within
+// the interval is served without the three requests.
+const ACTIVITY_DASHBOARD_TTL_MS = ACTIVITY_DASHBOARD_POLL_MS;
+const activityDashboardCache = new Map();
+
+onSignOut(() => {
+  etagCache.clear();
+  activityDashboardCache.clear();
+  // The index holds every policy, including investor names and emails
+  roiDueIndex.rebuild([]);
+});
 
 const useAdminApi = () => {
   const { apiFetch, isAuthenticated } = useAuth();
@@ -15,6 +49,63 @@ const useAdminApi = () => {
     return ranges[range] || 7;
   };
 
+  /**
+   * GET a URL, revalidating against the last response with If-None-Match
+   * Returns the cached body on 304 so unchanged pages are not re-downloaded
+   * @param {string} url - Page URL
+   * @param {Map} previous - Pages cached by the last walk of this list
+   * @param {Map} current - Pages seen by this walk
+   */
+  const fetchWithEtag = useCallback(async (url, previous, current) => {
+    const cached = previous.get(url);
+    const headers = cached ? { 'If-None-Match': cached.etag } : {};
+    const response = await apiFetch(url, { method: 'GET', headers });
+
+    if (response.status === 304 && cached) {
+      current.set(url, cached);
+      return cached.data;
+    }
+    if (!response.ok) {
+      console.error('Failed to fetch', url, response.status);
+      return null;
+    }
+
+    const data = await response.json();
+    // Only readable when the API exposes ETag over CORS; otherwise nothing is
+    // cached and If-None-Match is never sent
+    const etag = response.headers.get('ETag');
+    if (etag) current.set(url, { etag, data });
+    return data;
+  }, [apiFetch]);
+
+  /**
+   * Follow `next` links and collect every row of a paginated list endpoint
+   */
+  const fetchAllPages = useCallback(async (url) => {
+    const rows = [];
+    const previous = etagCache.get(url) || new Map();
+    const current = new Map();
+    let pageUrl = url;
+
+    while (pageUrl) {
+      const data = await fetchWithEtag(pageUrl, previous, current);
+      if (!data) break;
+
+      const batch = data.data || data.results || (Array.isArray(data) ? data : []);
+      rows.push(...batch);
+
+      // Check for next page
+      pageUrl = data.next ? data.next.replace(/^.*\/\/[^\/]+/, '') : null;
+    }
+
+    etagCache.delete(url);
+    etagCache.set(url, current);
+    if (etagCache.size > ETAG_CACHE_MAX_LISTS) {
+      etagCache.delete(etagCache.keys().next().value);
+    }
+    return rows;
+  }, [fetchWithEtag]);
+
   /**
     * Fetch all users with investment data integrated
     */
@@ -25,206 +116,28 @@ const useAdminApi = () => {
     }
 
     try {
-      // Fetch all users (handle pagination)
-      const allUsers = [];
-      let usersUrl = '/api/user/users/';
-
-      while (usersUrl) {
-        const usersResponse = await apiFetch(usersUrl, { method: 'GET' });
-        if (!usersResponse.ok) {
-          console.error('Failed to fetch users:', usersResponse.status);
-          break;
-        }
-
-        const usersData = await usersResponse.json();
-        const usersBatch = usersData.data || usersData.results || usersData || [];
-        allUsers.push(...usersBatch);
+      return await timeStage('fetchUsers', async () => {
+        // Users and policies are independent, so page through both at once
+        const [allUsers, allPolicies] = await Promise.all([
+          fetchAllPages('/api/user/users/'),
+          fetchAllPages(`/api/investments/policies/?page_size=${DIRECTORY_PAGE_SIZE}`),
+        ]);
 
-        // Check for next page
-        usersUrl = usersData.next ? usersData.next.replace(/^.*\/\/[^\/]+/, '') : null;
-      }
-
-      // Fetch all investment policies
-      const policiesResponse = await apiFetch('/api/investments/policies/', { method: 'GET' });
-      let allPolicies = [];
-      if (policiesResponse.ok) {
-        const policiesData = await policiesResponse.json();
-        allPolicies = policiesData.results || policiesData || [];
-      }
-
-      // Group policies by user
-      let policiesByUser = {};
-      allPolicies.forEach(policy => {
-        const userId = policy.user_details?.id;
-        if (userId) {
-          if (!policiesByUser[userId]) {
-            policiesByUser[userId] = [];
-          }
-          policiesByUser[userId].push(policy);
-        }
-      });
+        // Refill the due-date index from the same policy list
+        roiDueIndex.rebuild(allPolicies);
 
-      const mappedUsers = allUsers.map((u) => {
-        // Get policies for this user
-        const userPolicies = policiesByUser[u.id] || [];
-        
-        // Calculate totals from policies
-        const totalPrincipal = userPolicies.reduce((sum, p) => 
-          sum + parseFloat(p.principal_amount || 0), 0
-        );
-        const totalRoiBalance = userPolicies.reduce((sum, p) => 
-          sum + parseFloat(p.roi_balance || 0), 0
-        );
-        const totalBalance = userPolicies.reduce((sum, p) => 
-          sum + parseFloat(p.total_balance || 0), 0
-        );
-
-        // Get investment details from profile (legacy)
-        const investmentDetails = u.profile?.investment_details || [];
-        
-        // Map policies to investments format
-        const investments = userPolicies.map(policy => ({
-          id: policy.id,
-          policy_number: policy.policy_number,
-          investment_amount: policy.principal_amount,
-          remaining_balance: policy.current_balance,
-          roi_rate: policy.roi_rate,
-          investment_start_date: policy.start_date,
-          status: policy.status
-        }));
-
-        // Get withdrawals from user profile
-        const withdrawals = u.profile?.withdrawal_details || [];
-
-        // Get primary policy for ROI due date
-        const primaryPolicy = userPolicies[0];
-        const nextRoiDate = primaryPolicy?.roi_frequency === 'monthly' 
-          ? calculateNextRoiDate(primaryPolicy?.start_date)
-          : 'On Demand';
-
-        return {
-          id: u.id,
-          date: u.date_joined?.split('T')[0] || new Date().toISOString().split('T')[0],
-          uniquePolicy: primaryPolicy?.policy_number || 
-                       u.profile?.policy_number || 
-                       `PRO-${u.id.toString().padStart(6, '0')}`,
-          name: `${u.first_name || ''} ${u.last_name || ''}`.trim() || u.email,
-          email: u.email,
-          phoneNumber: u.profile?.work_phone || u.profile?.personal_phone || 'N/A',
-          role: u.role,
-          job_role: u.job_role,
-          department: u.profile?.department || 'N/A',
-          status: u.status,
-          address: `${u.profile?.street || ''}, ${u.profile?.city || ''}`.trim() || 'N/A',
-          dateOfBirth: u.profile?.dob || 'N/A',
-          gender: u.profile?.gender || 'N/A',
-          firstName: u.first_name || '',
-          surname: u.last_name || '',
-          otherName: u.middle_name || '',
-          residentialAddress: u.profile?.residential_address || 'N/A',
-          homeAddress: u.profile?.home_address || 'N/A',
-          sex: u.profile?.gender || 'N/A',
-          qualifications: u.profile?.professional_qualifications?.map(q => q.name) || [],
-          emergencyContact: {
-            name: u.profile?.next_of_kin || 'N/A',
-            phone: u.profile?.next_of_kin_phone_number || 'N/A',
-            relationship: u.profile?.relationship_to_next_of_kin || 'N/A',
-          },
-          kycStatus: u.profile?.kyc_status || 'Pending',
-          roiFrequency: primaryPolicy?.roi_frequency || u.profile?.roi_frequency || 'monthly',
-          policyDate: primaryPolicy?.start_date || 
-                     u.profile?.policy_date || 
-                     u.date_joined?.split('T')[0] || 
-                     new Date().toISOString().split('T')[0],
-          
-          // Investment amounts from policies
-          investmentAmount: totalPrincipal,
-          remainingBalance: totalBalance,
-          roiDue: totalRoiBalance,
-          roiDueDate: nextRoiDate,
-          
-          // Bank details
-          disbursementBank: u.profile?.bank_name || 'N/A',
-          accountName: u.profile?.account_name || 'N/A',
-          accountNumber: u.profile?.account_number || 'N/A',
-          
-          // Next of kin
-          nextOfKinName: u.profile?.next_of_kin_name || 'N/A',
-          nextOfKinAddress: u.profile?.next_of_kin_address || 'N/A',
-          nextOfKinPhone: u.profile?.next_of_kin_phone || 'N/A',
-          nextOfKinSex: u.profile?.next_of_kin_sex || 'N/A',
-          
-          // Additional fields
-          referredBy: u.profile?.referred_by || 'N/A',
-          signatureDate: u.profile?.signature_date || 'N/A',
-          passportPhoto: u.profile?.passport_photo,
-          investorSignature: u.profile?.investor_signature,
-          directorSignature: u.profile?.director_signature,
-          
-          // Investment and withdrawal arrays
-          investments: investments,
-          withdrawals: withdrawals,
-          
-          // All user policies
-          policies: userPolicies,
-
-          // Include full profile for access to investment_details
-          profile: u.profile,
-        };
+        return buildDirectory(allUsers, allPolicies);
       });
-
-      const sortedStaff = mappedUsers.filter(u => u.role === 'staff');
-      const sortedInvestors = mappedUsers.filter(u => u.role === 'investor');
-      const sortedPotentialInvestors = mappedUsers.filter(u => u.role === 'user');
-
-      return {
-        staff: sortedStaff,
-        investors: sortedInvestors,
-        potentialInvestors: sortedPotentialInvestors,
-      };
     } catch (err) {
       console.error('Error fetching users:', err);
       return { staff: [], investors: [], potentialInvestors: [] };
     }
-  }, [isAuthenticated, apiFetch]);
-
-  /**
-   * Calculate next ROI date based on policy start date
-   * Returns next month's 1st if investment was made between 1st-12th
-   * Returns month after next if investment was made after 12th
-   */
-  const calculateNextRoiDate = (startDate) => {
-    if (!startDate) return 'N/A';
-    
-    const start = new Date(startDate);
-    const day = start.getDate();
-    const now = new Date();
-    
-    let nextRoiDate = new Date(now.getFullYear(), now.getMonth() + 1, 1);
-    
-    // If investment was made after 12th, ROI starts from next month
-    if (day > 12) {
-      nextRoiDate = new Date(now.getFullYear(), now.getMonth() + 2, 1);
-    }
-    
-    // If we're past the ROI date, move to next month
-    if (nextRoiDate < now) {
-      nextRoiDate = new Date(now.getFullYear(), now.getMonth() + 1, 1);
-    }
-    
-    return nextRoiDate.toISOString().split('T')[0];
-  };
+  }, [isAuthenticated, fetchAllPages]);
 
   /**
-   * Fetch activity dashboard data
+   * Fetch the three activity dashboard panels and combine them into one response
    */
-  const fetchActivityDashboard = useCallback(async (timeRange) => {
-    if (!isAuthenticated) {
-      console.warn('User not authenticated - attempting fetch anyway');
-    }
-   
-    const days = getDaysFromRange(timeRange);
-   
+  const loadActivityDashboard = useCallback(async (days) => {
     try {
       const [statsRes, activitiesRes, securityRes] = await Promise.all([
         apiFetch(`/api/user/user-activities/dashboard/quick-stats/?days=${days}`),
@@ -277,7 +190,28 @@ const useAdminApi = () => {
       console.error('Failed to fetch dashboard data:', error);
       throw error;
     }
-  }, [isAuthenticated, apiFetch]);
+  }, [apiFetch]);
+
+  /**
+   * Fetch activity dashboard data
+   */
+  const fetchActivityDashboard = useCallback(async (timeRange) => {
+    if (!isAuthenticated) {
+      console.warn('User not authenticated - attempting fetch anyway');
+    }
+   
+    const days = getDaysFromRange(timeRange);
+
+    const cached = activityDashboardCache.get(days);
+    if (cached && Date.now() - cached.fetchedAt < ACTIVITY_DASHBOARD_TTL_MS) {
+      return cached.promise;
+    }
+
+    const promise = loadActivityDashboard(days);
+    activityDashboardCache.set(days, { promise, fetchedAt: Date.now() });
+    promise.catch(() => activityDashboardCache.delete(days));
+    return promise;
+  }, [isAuthenticated, loadActivityDashboard]);
 
   /**
    * Delete a user by ID
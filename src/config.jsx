@@ -45,6 +45,11 @@ const getConfig = () => {
   }
 };
 
-const config = getConfig();
+const config = {
+  ...getConfig(),
+  // Audit trail writer (services/auditTrail.js); off until the batch endpoint
+  // is deployed. Set VITE_AUDIT_TRAIL_ENABLED=true (e.g. in .env.local) to turn it on.
+  AUDIT_TRAIL_ENABLED: import.meta.env?.VITE_AUDIT_TRAIL_ENABLED === 'true',
+};
 
 export default config;
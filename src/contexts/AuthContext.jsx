@@ -1,10 +1,84 @@
 // src/contexts/AuthContext.jsx (Full, with rememberMe support in login)
-import React, { createContext, useContext, useState, useEffect, useCallback } from 'react';
+import React, { createContext, useContext, useState, useEffect, useCallback, useRef } from 'react';
 import { useNavigate } from 'react-router-dom';
 import config from '../config';
+import { recordAudit, setAuditTransport, setAuditUser } from '../services/auditTrail';
+import { recordLatency, incrementCounter, timeStage, endpointKey } from '../services/metrics';
 
 const AuthContext = createContext();
 
+// Refresh the access token this long before it expires
+const REFRESH_AHEAD_MS = 60 * 1000;
+const MIN_REFRESH_DELAY_MS = 10 * 1000;
+
+// Access token kept in memory so apiFetch does not read localStorage on every
+// request. localStorage stays the source of truth across reloads, and another
+// tab writing a new token drops the in-memory copy.
+let accessTokenCache;
+const tokenExpiries = new Map();
+
+// Module-level caches holding one user's data register here, and are dropped
+// whenever the stored tokens are cleared (logout or an invalid session)
+const signOutHandlers = new Set();
+
+export const onSignOut = (handler) => {
+  signOutHandlers.add(handler);
+  return () => signOutHandlers.delete(handler);
+};
+
+const getAccessToken = () => {
+  if (accessTokenCache === undefined) {
+    accessTokenCache = localStorage.getItem('access_token');
+  }
+  return accessTokenCache;
+};
+
+const storeAccessToken = (token) => {
+  localStorage.setItem('access_token', token);
+  accessTokenCache = token;
+};
+
+// Refreshes from every tab of this origin take turns, so only one tab spends
+// the rotating refresh token and the others pick up its result. Without Web
+// Locks only this tab's refreshes are serialised.
+const withRefreshLock = (fn) =>
+  typeof navigator !== 'undefined' && navigator.locks
+    ? navigator.locks.request('auth-token-refresh', fn)
+    : fn();
+
+const clearStoredTokens = () => {
+  localStorage.removeItem('access_token');
+  localStorage.removeItem('refresh_token');
+  accessTokenCache = null;
+  tokenExpiries.clear();
+  signOutHandlers.forEach(handler => handler());
+};
+
+if (typeof window !== 'undefined') {
+  window.addEventListener('storage', (event) => {
+    if (event.key === 'access_token' || event.key === null) {
+      accessTokenCache = undefined;
+    }
+  });
+}
+
+// Expiry (ms since epoch) from a JWT's exp claim, or null if it has none
+const getTokenExpiry = (token) => {
+  if (!token) return null;
+  if (tokenExpiries.has(token)) return tokenExpiries.get(token);
+
+  let expiry = null;
+  try {
+    const payload = token.split('.')[1].replace(/-/g, '+').replace(/_/g, '/');
+    const { exp } = JSON.parse(atob(payload));
+    expiry = exp ? exp * 1000 : null;
+  } catch {
+    expiry = null;
+  }
+  tokenExpiries.set(token, expiry);
+  return expiry;
+};
+
 export const useAuth = () => {
   const context = useContext(AuthContext);
   if (!context) {
@@ -20,6 +94,7 @@ const AuthProvider = ({ children }) => {
   const [isLoading, setIsLoading] = useState(true);
   const [authMode, setAuthMode] = useState('local');  // Force 'local' mode (Bearer) by default
   const navigate = useNavigate();
+  const refreshPromiseRef = useRef(null);
 
   // Helper to log all cookies
   const debugCookies = (context) => {
@@ -43,8 +118,10 @@ const AuthProvider = ({ children }) => {
   };
 
   // Local storage auth check (now primary)
-  const checkLocalAuth = async () => {
-    const token = localStorage.getItem('access_token');
+  // allowRefresh: false when called from inside a refresh, which would
+  // otherwise wait on its own single-flight promise and hold the lock forever
+  const checkLocalAuth = async ({ allowRefresh = true } = {}) => {
+    const token = getAccessToken();
     if (!token) {
       return false;
     }
@@ -75,7 +152,7 @@ const AuthProvider = ({ children }) => {
         return true;
       } else {
        // console.warn('⚠️ Local auth check failed, status:', response.status);
-        if (response.status === 401 || response.status === 403) {
+        if (allowRefresh && (response.status === 401 || response.status === 403)) {
          // console.log('🔄 Token invalid, attempting refresh...');
           const refreshSuccess = await refreshToken();
           return refreshSuccess;
@@ -148,7 +225,7 @@ const login = async (credentials) => {
 
       // Handle direct login (no OTP required)
       if (data.access && data.refresh) {
-        localStorage.setItem('access_token', data.access);
+        storeAccessToken(data.access);
         localStorage.setItem('refresh_token', data.refresh);
         //console.log('💾 Tokens stored in localStorage');
 
@@ -165,6 +242,8 @@ const login = async (credentials) => {
         });
         setIsAuthenticated(true);
         setAuthMode('local');
+        setAuditUser(data.user?.id);
+        recordAudit('auth.login', { user_id: data.user?.id });
         // console.log('✅ User & tenant data set directly from login response');
 
         return { success: true };
@@ -221,7 +300,7 @@ const verifyOTP = async (identifier, otpCode) => {
       debugCookies('after-otp-verification');
 
       if (data.access && data.refresh) {
-        localStorage.setItem('access_token', data.access);
+        storeAccessToken(data.access);
         localStorage.setItem('refresh_token', data.refresh);
         // console.log('💾 Tokens stored in localStorage');
 
@@ -238,6 +317,8 @@ const verifyOTP = async (identifier, otpCode) => {
         });
         setIsAuthenticated(true);
         setAuthMode('local');
+        setAuditUser(data.user?.id);
+        recordAudit('auth.login', { user_id: data.user?.id, otp: true });
         // console.log('✅ User & tenant data set after OTP verification');
 
         return { success: true };
@@ -263,7 +344,16 @@ const verifyOTP = async (identifier, otpCode) => {
 };
 
 // Refresh token (local mode only, since forced)
-  const refreshToken = useCallback(async () => {
+  // `seen` is the access token the caller found wanting
+  const exchangeRefreshToken = async (seen) => {
+    // Another tab may have refreshed while this one waited for the lock
+    accessTokenCache = undefined;
+    const current = getAccessToken();
+    const expiry = getTokenExpiry(current);
+    if (current && current !== seen && (!expiry || expiry - Date.now() > REFRESH_AHEAD_MS)) {
+      return true;
+    }
+
     const refresh = localStorage.getItem('refresh_token');
     if (!refresh) {
       await logout();
@@ -284,26 +374,50 @@ const verifyOTP = async (identifier, otpCode) => {
        // console.log('✅ Token refresh successful');
         
         if (data.access) {  // Backend returns 'access'
-          localStorage.setItem('access_token', data.access);
+          storeAccessToken(data.access);
         }
         if (data.refresh) {  // Backend returns 'refresh'
           localStorage.setItem('refresh_token', data.refresh);
         }
         
         // Sync state
-        await checkLocalAuth();
+        await checkLocalAuth({ allowRefresh: false });
         return true;
       } else {
         const errorText = await response.text();
         console.warn('⚠️ Token refresh failed, status:', response.status, 'error:', errorText);
-        await logout();
-        return false;
+        return handleRefreshFailure(refresh);
       }
     } catch (err) {
       console.error('❌ Refresh token error:', err);
-      await logout();
-      return false;
+      return handleRefreshFailure(refresh);
+    }
+  };
+
+  // A tab without Web Locks may have rotated the refresh token under this one;
+  // the session is still good then, and logging out would revoke the new token
+  const handleRefreshFailure = async (spent) => {
+    const latest = localStorage.getItem('refresh_token');
+    if (latest && latest !== spent) {
+      accessTokenCache = undefined;
+      return true;
+    }
+    await logout();
+    return false;
+  };
+
+  // Single-flight: concurrent callers (e.g. a burst of 401s) share one refresh
+  // instead of racing each other with a rotating refresh token, and tabs take
+  // turns through the refresh lock
+  const refreshToken = useCallback(() => {
+    if (!refreshPromiseRef.current) {
+      const seen = getAccessToken();
+      refreshPromiseRef.current = timeStage('tokenRefresh', () => withRefreshLock(() => exchangeRefreshToken(seen)))
+        .finally(() => {
+          refreshPromiseRef.current = null;
+        });
     }
+    return refreshPromiseRef.current;
   }, []);
 
   // Logout (local mode)
@@ -317,8 +431,7 @@ const verifyOTP = async (identifier, otpCode) => {
         body: JSON.stringify({ refresh: refresh }),  // Backend expects 'refresh'
       });
     }
-    localStorage.removeItem('access_token');
-    localStorage.removeItem('refresh_token');
+    clearStoredTokens();
     
     // Clear state
     setIsAuthenticated(false);
@@ -330,7 +443,17 @@ const verifyOTP = async (identifier, otpCode) => {
 
   // API helper (always prefer Bearer if token exists)
   const apiFetch = useCallback(async (url, options = {}) => {
-    const token = localStorage.getItem('access_token');  // Always check local first
+    const started = performance.now();
+    const endpoint = `${(options.method || 'GET').toUpperCase()} ${endpointKey(url)}`;
+    let token = getAccessToken();
+
+    // Don't send a token that is about to expire; wait for (or start) a refresh
+    const expiry = getTokenExpiry(token);
+    if (expiry && expiry - Date.now() < MIN_REFRESH_DELAY_MS) {
+      await refreshToken();
+      token = getAccessToken();
+    }
+
     const headers = {
       ...options.headers,
     };
@@ -365,34 +488,70 @@ const verifyOTP = async (identifier, otpCode) => {
 
     if (response.status === 401) {
      // console.log('🔄 API call returned 401, attempting refresh...');
-      const refreshed = await refreshToken();
+      // Another request may already have refreshed since this one was sent
+      const current = getAccessToken();
+      const refreshed = (current && current !== token) || await refreshToken();
       if (refreshed) {
         // Re-fetch with new token
-        const newToken = localStorage.getItem('access_token');
+        const newToken = getAccessToken();
         if (newToken) {
           fetchConfig.headers.Authorization = `Bearer ${newToken}`;
         }
         response = await fetch(`${config.API_BASE_URL}${url}`, fetchConfig);
+        incrementCounter('api.retried_after_refresh');
       }
     }
 
+    // Per-endpoint latency, status counts, and the server's query count when
+    // it reports one (X-DB-Query-Count must be exposed over CORS)
+    recordLatency(`api ${endpoint}`, performance.now() - started);
+    incrementCounter('api.requests');
+    if (response.status >= 400) incrementCounter(`api.status.${response.status}`);
+    const queryCount = response.headers.get('X-DB-Query-Count');
+    if (queryCount !== null) incrementCounter(`db_queries ${endpoint}`, Number(queryCount));
+
     return response;
   }, [refreshToken]);
 
+  // Refresh proactively shortly before the access token expires, so requests
+  // rarely hit a 401 at all
+  useEffect(() => {
+    if (!isAuthenticated) return undefined;
+
+    let timer = null;
+    const schedule = () => {
+      const expiry = getTokenExpiry(getAccessToken());
+      if (!expiry) return;
+      const delay = Math.max(expiry - Date.now() - REFRESH_AHEAD_MS, MIN_REFRESH_DELAY_MS);
+      timer = setTimeout(async () => {
+        if (await refreshToken()) schedule();
+      }, delay);
+    };
+    schedule();
+
+    return () => clearTimeout(timer);
+  }, [isAuthenticated, refreshToken]);
+
+  // Audit entries are kept per user and only sent with that user's token; they
+  // are held (and persisted) while signed out
+  useEffect(() => {
+    setAuditUser(isAuthenticated ? user?.id : null);
+    setAuditTransport(isAuthenticated ? apiFetch : null);
+  }, [isAuthenticated, user?.id, apiFetch]);
+
   useEffect(() => {
     const initializeAuth = async () => {
       //console.log('🚀 Initializing auth...');
       debugCookies('initialization');
       
       // Prioritize local mode if tokens exist
-      if (localStorage.getItem('access_token')) {
+      if (getAccessToken()) {
         const success = await checkLocalAuth();
         if (success) {
           setAuthMode('local');
         } else {
           // Clear invalid tokens
-          localStorage.removeItem('access_token');
-          localStorage.removeItem('refresh_token');
+          clearStoredTokens();
         }
       }
       setIsLoading(false);
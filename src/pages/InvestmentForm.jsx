@@ -4,6 +4,7 @@ import { useNavigate, useParams } from 'react-router-dom';
 import config from '../config';
 import './InvestmentForm.css';
 import pako from 'pako';
+import { prepareImageUpload } from '../utils/imageUpload';
 
 const InvestmentForm = ({ onSubmit }) => {
   const navigate = useNavigate();
@@ -39,6 +40,7 @@ const InvestmentForm = ({ onSubmit }) => {
   const [tenantInfo, setTenantInfo] = useState(null);
   const investorSignatureRef = useRef(null);
   const directorSignatureRef = useRef(null);
+  const selectedFilesRef = useRef({});
   const [investorSignature, setInvestorSignature] = useState(null);
   const [directorSignature, setDirectorSignature] = useState(null);
   const [showSuccessModal, setShowSuccessModal] = useState(false);
@@ -82,8 +84,8 @@ const InvestmentForm = ({ onSubmit }) => {
     const canvas2 = directorSignatureRef.current;
     const ctx2 = canvas2.getContext('2d');
 
-    let isDrawing1 = false, lastX1 = 0, lastY1 = 0;
-    let isDrawing2 = false, lastX2 = 0, lastY2 = 0;
+    let isDrawing1 = false, hasStroke1 = false, lastX1 = 0, lastY1 = 0;
+    let isDrawing2 = false, hasStroke2 = false, lastX2 = 0, lastY2 = 0;
 
     const startDrawing1 = (e) => {
       isDrawing1 = true;
@@ -103,10 +105,17 @@ const InvestmentForm = ({ onSubmit }) => {
       ctx1.lineWidth = 2;
       ctx1.stroke();
       [lastX1, lastY1] = [x, y];
-      setInvestorSignature(canvas1.toDataURL());
+      hasStroke1 = true;
     };
 
-    const stopDrawing1 = () => { isDrawing1 = false; };
+    // Export the signature once per stroke rather than on every mousemove
+    const stopDrawing1 = () => {
+      if (isDrawing1 && hasStroke1) {
+        setInvestorSignature(canvas1.toDataURL());
+      }
+      isDrawing1 = false;
+      hasStroke1 = false;
+    };
 
     const startDrawing2 = (e) => {
       isDrawing2 = true;
@@ -126,10 +135,17 @@ const InvestmentForm = ({ onSubmit }) => {
       ctx2.lineWidth = 2;
       ctx2.stroke();
       [lastX2, lastY2] = [x, y];
-      setDirectorSignature(canvas2.toDataURL());
+      hasStroke2 = true;
     };
 
-    const stopDrawing2 = () => { isDrawing2 = false; };
+    // Export the signature once per stroke rather than on every mousemove
+    const stopDrawing2 = () => {
+      if (isDrawing2 && hasStroke2) {
+        setDirectorSignature(canvas2.toDataURL());
+      }
+      isDrawing2 = false;
+      hasStroke2 = false;
+    };
 
     // Event listeners for canvas 1
     canvas1.addEventListener('mousedown', startDrawing1);
@@ -237,11 +253,35 @@ const InvestmentForm = ({ onSubmit }) => {
 
   const handleChange = (e) => {
     const { name, value, files } = e.target;
+    if (files) {
+      handleFileChange(name, files[0]);
+      return;
+    }
+    setFormData(prev => ({
+      ...prev,
+      [name]: value
+    }));
+    setErrors(prev => ({ ...prev, [name]: '' }));
+  };
+
+  // Downscale photos in the browser so the upload stays small. The original
+  // file is kept until the smaller one is ready, so submitting mid-resize
+  // still sends the current selection, and a resize that finishes after the
+  // user picked another file is discarded.
+  const handleFileChange = async (name, file) => {
+    selectedFilesRef.current[name] = file;
     setFormData(prev => ({
       ...prev,
-      [name]: files ? files[0] : value
+      [name]: file
     }));
     setErrors(prev => ({ ...prev, [name]: '' }));
+
+    const upload = await prepareImageUpload(file);
+    if (upload === file || selectedFilesRef.current[name] !== file) return;
+    setFormData(prev => ({
+      ...prev,
+      [name]: upload
+    }));
   };
 
   const handleSubmit = async (e) => {
@@ -1,9 +1,38 @@
 // src/services/InvestmentApiService.jsx
-import { useAuth } from '../contexts/AuthContext';
+import { useAuth, onSignOut } from '../contexts/AuthContext';
+import { writeLedgerCsv } from '../utils/ledgerExport';
+import { LedgerAggregates } from '../utils/ledgerAggregates';
+import { roiDueIndex } from '../utils/roiDueIndex';
+import { recordAudit } from './auditTrail';
+import { timeStage } from './metrics';
 
 
 import { useCallback } from 'react';
 
+// Ledger report responses (summary, by_policy, monthly_report), reused for a
+// short while by callers that ask for the same report again. Dropped as soon
+// as this client writes to the ledger, and on sign-out since the reports
+// belong to the signed-in user's tenant.
+const LEDGER_REPORT_TTL_MS = 60000;
+const ledgerReportCache = new Map();
+
+const readLedgerReport = (url) => {
+  const cached = ledgerReportCache.get(url);
+  if (cached && Date.now() - cached.fetchedAt < LEDGER_REPORT_TTL_MS) {
+    return cached.data;
+  }
+  return null;
+};
+
+const storeLedgerReport = (url, data) => {
+  ledgerReportCache.set(url, { data, fetchedAt: Date.now() });
+  return data;
+};
+
+const invalidateLedgerReports = () => ledgerReportCache.clear();
+
+onSignOut(invalidateLedgerReports);
+
 const useInvestmentApi = () => {
   const { apiFetch, isAuthenticated } = useAuth();
 
@@ -46,7 +75,11 @@ const useInvestmentApi = () => {
       });
 
       if (response.ok) {
-        return { success: true, data: await response.json() };
+        invalidateLedgerReports();
+        const data = await response.json();
+        roiDueIndex.upsert(data);
+        recordAudit('policy.created', { policy_id: data.id, principal_amount: policyData.principal_amount });
+        return { success: true, data };
       } else {
         const error = await response.json();
         return { success: false, error: error.detail || 'Failed to create policy' };
@@ -144,6 +177,8 @@ const useInvestmentApi = () => {
       );
 
       if (response.ok) {
+        recordAudit('policy.roi_frequency_changed', { policy_id: policyId, roi_frequency: roiFrequency });
+        roiDueIndex.setFrequency(policyId, roiFrequency);
         return { success: true, data: await response.json() };
       } else {
         const error = await response.json();
@@ -193,7 +228,16 @@ const useInvestmentApi = () => {
       });
 
       if (response.ok) {
-        return { success: true, data: await response.json() };
+        const data = await response.json();
+        // Bank details stay out of the audit queue, which sits in localStorage
+        recordAudit('withdrawal.created', {
+          withdrawal_id: data.id,
+          policy_id: withdrawalData.policy,
+          withdrawal_type: withdrawalData.withdrawal_type,
+          amount_requested: withdrawalData.amount_requested,
+        });
+        invalidateLedgerReports();
+        return { success: true, data };
       } else {
         const error = await response.json();
         return { success: false, error: error.detail || error };
@@ -217,6 +261,8 @@ const useInvestmentApi = () => {
       );
 
       if (response.ok) {
+        recordAudit('withdrawal.approved', { withdrawal_id: withdrawalId });
+        invalidateLedgerReports();
         return { success: true, data: await response.json() };
       } else {
         const error = await response.json();
@@ -241,6 +287,8 @@ const useInvestmentApi = () => {
       );
 
       if (response.ok) {
+        recordAudit('withdrawal.processed', { withdrawal_id: withdrawalId });
+        invalidateLedgerReports();
         return { success: true, data: await response.json() };
       } else {
         const error = await response.json();
@@ -268,6 +316,8 @@ const useInvestmentApi = () => {
       );
 
       if (response.ok) {
+        recordAudit('policy.topped_up', { policy_id: policyId, amount });
+        invalidateLedgerReports();
         return { success: true, data: await response.json() };
       } else {
         const error = await response.json();
@@ -313,10 +363,13 @@ const useInvestmentApi = () => {
     try {
       const queryString = new URLSearchParams(params).toString();
       const url = `/api/investments/ledger/summary/${queryString ? `?${queryString}` : ''}`;
+      const cached = readLedgerReport(url);
+      if (cached) return cached;
+
       const response = await apiFetch(url, { method: 'GET' });
 
       if (response.ok) {
-        return await response.json();
+        return storeLedgerReport(url, await response.json());
       } else {
         console.error('Failed to fetch ledger summary:', response.status);
         return null;
@@ -351,6 +404,75 @@ const useInvestmentApi = () => {
     }
   }, [isAuthenticated, apiFetch]);
 
+  /**
+   * Stream ledger entries page by page, following the `next` cursor
+   * Yields one page (array of entries) at a time so callers never hold the
+   * whole ledger in memory
+   */
+  const streamLedger = useCallback(async function* (params = {}) {
+    if (!isAuthenticated) return;
+
+    const queryString = new URLSearchParams({ page_size: 500, ...params }).toString();
+    let url = `/api/investments/ledger/?${queryString}`;
+
+    while (url) {
+      const response = await apiFetch(url, { method: 'GET' });
+      if (!response.ok) {
+        throw new Error(`Failed to fetch ledger page: ${response.status}`);
+      }
+
+      const data = await response.json();
+      const rows = data.results || [];
+      if (rows.length > 0) yield rows;
+
+      url = data.next ? data.next.replace(/^.*\/\/[^/]+/, '') : null;
+    }
+  }, [isAuthenticated, apiFetch]);
+
+  /**
+   * Export ledger to CSV on the client, writing one page at a time
+   */
+  const exportLedgerCsv = useCallback(async (params = {}, onProgress) => {
+    if (!isAuthenticated) return null;
+
+    try {
+      return await timeStage('exportLedgerCsv', () => writeLedgerCsv(streamLedger(params), onProgress));
+    } catch (error) {
+      console.error('Error exporting ledger:', error);
+      return null;
+    }
+  }, [isAuthenticated, streamLedger]);
+
+  /**
+   * Recompute ledger aggregates from the raw entries and diff them against
+   * the stored summary, per-policy and monthly reports
+   * The stored reports are fetched fresh, bypassing the report cache.
+   */
+  const verifyLedgerSummary = useCallback(async () => {
+    if (!isAuthenticated) return null;
+
+    try {
+      const fetchReport = async (url) => {
+        const response = await apiFetch(url, { method: 'GET' });
+        if (!response.ok) throw new Error(`Failed to fetch ${url}: ${response.status}`);
+        return response.json();
+      };
+      const [summary, byPolicy, byMonth] = await Promise.all([
+        fetchReport('/api/investments/ledger/summary/'),
+        fetchReport('/api/investments/ledger/by_policy/'),
+        fetchReport('/api/investments/ledger/monthly_report/'),
+      ]);
+
+      const aggregates = await timeStage('verifyLedgerSummary', () => LedgerAggregates.rebuild(streamLedger()));
+      const mismatches = aggregates.diff(summary, { byPolicy, byMonth });
+
+      return { summary, aggregates: aggregates.toJSON(), mismatches, ok: mismatches.length === 0 };
+    } catch (error) {
+      console.error('Error verifying ledger summary:', error);
+      return null;
+    }
+  }, [isAuthenticated, apiFetch, streamLedger]);
+
   /**
    * Get ledger grouped by policy
    */
@@ -358,12 +480,16 @@ const useInvestmentApi = () => {
     if (!isAuthenticated) return [];
 
     try {
-      const response = await apiFetch('/api/investments/ledger/by_policy/', {
+      const url = '/api/investments/ledger/by_policy/';
+      const cached = readLedgerReport(url);
+      if (cached) return cached;
+
+      const response = await apiFetch(url, {
         method: 'GET',
       });
 
       if (response.ok) {
-        return await response.json();
+        return storeLedgerReport(url, await response.json());
       } else {
         console.error('Failed to fetch ledger by policy:', response.status);
         return [];
@@ -381,12 +507,16 @@ const useInvestmentApi = () => {
     if (!isAuthenticated) return null;
 
     try {
-      const response = await apiFetch('/api/investments/ledger/monthly_report/', {
+      const url = '/api/investments/ledger/monthly_report/';
+      const cached = readLedgerReport(url);
+      if (cached) return cached;
+
+      const response = await apiFetch(url, {
         method: 'GET',
       });
 
       if (response.ok) {
-        return await response.json();
+        return storeLedgerReport(url, await response.json());
       } else {
         console.error('Failed to fetch monthly report:', response.status);
         return null;
@@ -508,6 +638,8 @@ const useInvestmentApi = () => {
       });
 
       if (response.ok) {
+        recordAudit('roi.accrued');
+        invalidateLedgerReports();
         return { success: true, data: await response.json() };
       } else {
         const error = await response.json();
@@ -734,6 +866,7 @@ const useInvestmentApi = () => {
       });
 
       if (response.ok) {
+        recordAudit('tax_certificate.approved', { certificate_id: certificateId });
         return { success: true, data: await response.json() };
       } else {
         const error = await response.json();
@@ -890,8 +1023,11 @@ const useInvestmentApi = () => {
     getLedger,
     getLedgerSummary,
     exportLedger,
+    streamLedger,
+    exportLedgerCsv,
     getLedgerByPolicy,
     getMonthlyLedgerReport,
+    verifyLedgerSummary,
 
     // Statements
     generateStatement,
@@ -0,0 +1,348 @@
+// src/services/auditTrail.js
+// Client-side audit trail. Recording an entry never waits on the network: the
+// entry is hash-chained to the previous one (SHA-256 over the previous hash and
+// the entry), queued, and a background writer sends the queue in batches.
+// The batch endpoint is not deployed yet, so the writer stays off unless
+// VITE_AUDIT_TRAIL_ENABLED=true (config.AUDIT_TRAIL_ENABLED); while it is off
+// nothing is recorded.
+//
+// The client computes both the entry and its hash, so the chain only proves
+// the trail was not altered after ingest if the server re-chains it: on ingest
+// each entry's prev_hash must match the hash of the last entry stored for that
+// user, and the server recomputes the hash rather than trusting the client's.
+// Locally, verifyAuditChain checks the pending queue (see getAuditMetrics).
+//
+// Queue and chain head live in localStorage under the signed-in user's id, so
+// every tab of that user appends to one chain and entries are only ever sent
+// with the token of the user who recorded them. Tabs take a Web Lock to append,
+// and only one tab flushes at a time. Queued entries are never dropped: once
+// AUDIT_MAX_PENDING entries are waiting (e.g. while the writer is stopped), new
+// actions are counted instead of queued, and the count is chained as an
+// explicit 'audit.gap' entry as soon as there is room again, so the server
+// sees how many actions are missing and when rather than a broken chain.
+// A 4xx from the endpoint stops the writer until the next sign-in; other
+// failures back off.
+
+import config from '../config';
+
+const AUDIT_BATCH_URL = '/api/user/user-activities/batch/';
+const AUDIT_BATCH_SIZE = 50;
+const AUDIT_MAX_PENDING = 500;
+const AUDIT_FLUSH_INTERVAL_MS = 2000;
+const AUDIT_MAX_RETRY_MS = 5 * 60 * 1000;
+const PENDING_KEY = 'audit_pending';
+const CHAIN_HEAD_KEY = 'audit_chain_head';
+const GAP_KEY = 'audit_gap';
+const GAP_ACTION = 'audit.gap';
+const GENESIS_HASH = '0'.repeat(64);
+
+let userId = null;
+let send = null;
+let timer = null;
+let retryDelay = AUDIT_FLUSH_INTERVAL_MS;
+let stopped = false;
+let flushing = false;
+let gapWarned = false;
+const localLocks = new Map();
+
+const metrics = {
+  flushes: 0,
+  failures: 0,
+  gapsRecorded: 0,
+  entriesWritten: 0,
+  lastFlushMs: 0,
+  maxFlushMs: 0,
+  totalFlushMs: 0,
+};
+
+const storageKey = (key, user) => `${key}:${user}`;
+
+const readStored = (key, fallback) => {
+  try {
+    const value = localStorage.getItem(key);
+    return value ? JSON.parse(value) : fallback;
+  } catch {
+    return fallback;
+  }
+};
+
+const readQueue = (user) => readStored(storageKey(PENDING_KEY, user), []);
+
+const readHead = (user) => readStored(storageKey(CHAIN_HEAD_KEY, user), { sequence: 0, hash: GENESIS_HASH });
+
+// Actions not queued because the queue was full: { omitted, from, to, actions }
+const readGap = (user) => readStored(storageKey(GAP_KEY, user), null);
+
+const persist = (user, queue, head, gap) => {
+  try {
+    localStorage.setItem(storageKey(PENDING_KEY, user), JSON.stringify(queue));
+    if (head) localStorage.setItem(storageKey(CHAIN_HEAD_KEY, user), JSON.stringify(head));
+    if (gap !== undefined) {
+      if (gap) {
+        localStorage.setItem(storageKey(GAP_KEY, user), JSON.stringify(gap));
+      } else {
+        localStorage.removeItem(storageKey(GAP_KEY, user));
+      }
+    }
+  } catch (error) {
+    console.warn('Could not persist audit queue:', error);
+  }
+};
+
+// Run fn holding a lock shared by every tab of this origin. Without Web Locks
+// only this tab's calls are serialised.
+const withLock = (name, options, fn) => {
+  if (typeof navigator !== 'undefined' && navigator.locks) {
+    return navigator.locks.request(name, options, fn);
+  }
+  const run = (localLocks.get(name) || Promise.resolve()).then(() => fn({ name }));
+  localLocks.set(name, run.catch(() => {}));
+  return run;
+};
+
+// JSON with object keys sorted, so the same entry always hashes the same
+const canonicalJson = (value) => {
+  if (Array.isArray(value)) return `[${value.map(canonicalJson).join(',')}]`;
+  if (value && typeof value === 'object') {
+    return `{${Object.keys(value).sort()
+      .filter(key => value[key] !== undefined)
+      .map(key => `${JSON.stringify(key)}:${canonicalJson(value[key])}`)
+      .join(',')}}`;
+  }
+  return JSON.stringify(value ?? null);
+};
+
+const sha256 = async (text) => {
+  const digest = await crypto.subtle.digest('SHA-256', new TextEncoder().encode(text));
+  return [...new Uint8Array(digest)].map(byte => byte.toString(16).padStart(2, '0')).join('');
+};
+
+/**
+ * Hash of an audit entry, covering everything except the hash itself
+ */
+export const hashAuditEntry = (entry) => {
+  const { sequence, timestamp, action, details, prev_hash } = entry;
+  return sha256(canonicalJson({ sequence, timestamp, action, details, prev_hash }));
+};
+
+const chainEntry = async (head, timestamp, action, details) => {
+  const entry = {
+    sequence: head.sequence + 1,
+    timestamp,
+    action,
+    details,
+    prev_hash: head.hash,
+  };
+  entry.hash = await hashAuditEntry(entry);
+  return entry;
+};
+
+const scheduleFlush = (delay = AUDIT_FLUSH_INTERVAL_MS) => {
+  if (timer || stopped || !send) return;
+  timer = setTimeout(() => {
+    timer = null;
+    flushAudit();
+  }, delay);
+};
+
+// A 4xx will not succeed on retry (missing endpoint, bad payload); 408 and
+// 429 are the exceptions
+const isPermanentFailure = (status) => status >= 400 && status < 500 && status !== 408 && status !== 429;
+
+/**
+ * Send the signed-in user's queued entries in batches until the queue is empty
+ * or a batch fails. Skipped when another tab is already flushing.
+ */
+export const flushAudit = async () => {
+  const user = userId;
+  const transport = send;
+  if (!config.AUDIT_TRAIL_ENABLED || !transport || !user || stopped || flushing) return;
+
+  flushing = true;
+  let failed = false;
+  try {
+    await withLock(`audit-flush:${user}`, { ifAvailable: true }, async (lock) => {
+      if (!lock) return;
+
+      // Only the flushing tab removes entries, and it only removes the ones it
+      // sent, so entries other tabs append meanwhile are kept
+      let batch = readQueue(user).slice(0, AUDIT_BATCH_SIZE);
+      while (batch.length > 0 && userId === user) {
+        const started = performance.now();
+        const response = await transport(AUDIT_BATCH_URL, {
+          method: 'POST',
+          body: JSON.stringify({ entries: batch }),
+        });
+        const elapsed = performance.now() - started;
+
+        metrics.flushes += 1;
+        metrics.lastFlushMs = elapsed;
+        metrics.maxFlushMs = Math.max(metrics.maxFlushMs, elapsed);
+        metrics.totalFlushMs += elapsed;
+
+        if (!response.ok) {
+          metrics.failures += 1;
+          failed = true;
+          if (isPermanentFailure(response.status)) {
+            stopped = true;
+            console.error('Audit endpoint rejected entries, writer stopped:', response.status);
+          } else {
+            console.error('Failed to write audit entries:', response.status);
+          }
+          return;
+        }
+
+        const lastSent = batch[batch.length - 1].sequence;
+        await withLock(`audit:${user}`, {}, () => {
+          persist(user, readQueue(user).filter(entry => entry.sequence > lastSent));
+        });
+        metrics.entriesWritten += batch.length;
+        batch = readQueue(user).slice(0, AUDIT_BATCH_SIZE);
+      }
+    });
+  } catch (error) {
+    metrics.failures += 1;
+    failed = true;
+    console.error('Error writing audit entries:', error);
+  } finally {
+    flushing = false;
+  }
+
+  if (failed) {
+    scheduleFlush(retryDelay);
+    retryDelay = Math.min(retryDelay * 2, AUDIT_MAX_RETRY_MS);
+  } else {
+    retryDelay = AUDIT_FLUSH_INTERVAL_MS;
+  }
+};
+
+/**
+ * Record an audit entry for the signed-in user
+ * Returns once the entry is chained and queued, not when it is written. When
+ * the queue is full the action is counted towards the next 'audit.gap' entry
+ * instead, and null is returned.
+ * @param {string} action - e.g. 'withdrawal.approved'
+ * @param {object} details - Ids and amounts only; entries sit in localStorage
+ * @returns {Promise<object|null>} - The queued entry, or null when not recorded
+ */
+export const recordAudit = async (action, details = {}) => {
+  const user = userId;
+  if (!config.AUDIT_TRAIL_ENABLED || !user) return null;
+
+  try {
+    const entry = await withLock(`audit:${user}`, {}, async () => {
+      // Read under the lock: another tab may have appended since
+      const queue = readQueue(user);
+      const gap = readGap(user);
+      const timestamp = new Date().toISOString();
+
+      // Room for the gap entry as well as this one
+      if (queue.length + (gap ? 2 : 1) > AUDIT_MAX_PENDING) {
+        persist(user, queue, null, {
+          omitted: (gap?.omitted || 0) + 1,
+          from: gap?.from || timestamp,
+          to: timestamp,
+          actions: { ...gap?.actions, [action]: (gap?.actions?.[action] || 0) + 1 },
+        });
+        return { queued: null, depth: queue.length };
+      }
+
+      let head = readHead(user);
+      if (gap) {
+        const gapEntry = await chainEntry(head, timestamp, GAP_ACTION, gap);
+        queue.push(gapEntry);
+        head = gapEntry;
+        metrics.gapsRecorded += 1;
+      }
+      const queued = await chainEntry(head, timestamp, action, details);
+      queue.push(queued);
+      persist(user, queue, { sequence: queued.sequence, hash: queued.hash }, gap ? null : undefined);
+      return { queued, depth: queue.length };
+    });
+
+    if (!entry.queued && !gapWarned) {
+      gapWarned = true;
+      console.warn(`Audit queue is full (${AUDIT_MAX_PENDING} entries); new actions are counted until it drains`);
+    }
+
+    if (entry.depth >= AUDIT_BATCH_SIZE) {
+      flushAudit();
+    } else {
+      scheduleFlush();
+    }
+    return entry.queued;
+  } catch (error) {
+    console.error('Error recording audit entry:', error);
+    return null;
+  }
+};
+
+/**
+ * Set the user entries are recorded for, or null while signed out
+ * Switching user drops the transport, so one user's entries are never sent
+ * with another user's token.
+ */
+export const setAuditUser = (id) => {
+  const next = id ?? null;
+  if (next === userId) return;
+
+  userId = next;
+  send = null;
+  stopped = false;
+  gapWarned = false;
+  retryDelay = AUDIT_FLUSH_INTERVAL_MS;
+  clearTimeout(timer);
+  timer = null;
+};
+
+/**
+ * Set the function used to send batches (apiFetch) for the current user, or
+ * null to hold entries until one is available again
+ */
+export const setAuditTransport = (transport) => {
+  send = transport;
+  if (send && userId && config.AUDIT_TRAIL_ENABLED && readQueue(userId).length > 0) scheduleFlush();
+};
+
+/**
+ * Check that a run of entries is intact
+ * Every hash is recomputed and every prev_hash must match the entry before it.
+ * @param {object[]} entries - Entries in sequence order
+ * @returns {Promise<object>} - { ok, brokenAt, reason } with brokenAt the first bad index
+ */
+export const verifyAuditChain = async (entries) => {
+  for (let i = 0; i < entries.length; i++) {
+    const entry = entries[i];
+    if (i > 0 && entry.prev_hash !== entries[i - 1].hash) {
+      return { ok: false, brokenAt: i, reason: 'prev_hash does not match previous entry' };
+    }
+    if (await hashAuditEntry(entry) !== entry.hash) {
+      return { ok: false, brokenAt: i, reason: 'hash does not match entry contents' };
+    }
+  }
+  return { ok: true, brokenAt: null, reason: null };
+};
+
+/**
+ * Writer metrics: queue depth, actions waiting for a gap entry, flush latency,
+ * and whether the queued entries still form an intact chain
+ * @returns {Promise<object>}
+ */
+export const getAuditMetrics = async () => {
+  const queue = userId ? readQueue(userId) : [];
+  const check = await verifyAuditChain(queue);
+  return {
+    enabled: Boolean(config.AUDIT_TRAIL_ENABLED),
+    queueDepth: queue.length,
+    queueIntact: check.ok,
+    omitted: userId ? readGap(userId)?.omitted || 0 : 0,
+    stopped,
+    flushes: metrics.flushes,
+    failures: metrics.failures,
+    gapsRecorded: metrics.gapsRecorded,
+    entriesWritten: metrics.entriesWritten,
+    lastFlushMs: metrics.lastFlushMs,
+    maxFlushMs: metrics.maxFlushMs,
+    avgFlushMs: metrics.flushes ? metrics.totalFlushMs / metrics.flushes : 0,
+  };
+};
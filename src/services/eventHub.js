@@ -0,0 +1,209 @@
+// src/services/eventHub.js
+// One event hub per browser tab. Components subscribe to a topic instead of
+// running their own setInterval; every topic has at most one poller no matter
+// how many components listen, polling pauses while the tab is hidden, and
+// subscribers are only called when something actually changed.
+//
+// When the API exposes a server-sent events stream, connectEventStream() feeds
+// it into the same topics and pollers stand down while it is open. publish()
+// is the in-process broker used by both transports, and can be called
+// directly to push local changes (or in tests).
+
+const DEFAULT_INTERVAL_MS = 30000;
+const DEFAULT_MAX_PENDING = 200;
+
+const topics = new Map();
+let stream = null;
+let visibilityListening = false;
+
+const isHidden = () => typeof document !== 'undefined' && document.hidden;
+
+const isStreamOpen = () =>
+  stream !== null && typeof EventSource !== 'undefined' && stream.readyState === EventSource.OPEN;
+
+const getTopic = (name) => {
+  let topic = topics.get(name);
+  if (!topic) {
+    topic = {
+      name,
+      subscribers: new Set(),
+      source: null,
+      timer: null,
+      inFlight: false,
+      snapshot: [],
+      signature: null,
+      seenKeys: new Set(),
+    };
+    topics.set(name, topic);
+  }
+  return topic;
+};
+
+// Queue events per subscriber and hand them over in one batch per tick.
+// A subscriber that falls behind keeps only its newest events and is told how
+// many were dropped, so it can resync instead of growing without bound.
+const flush = (subscriber) => {
+  subscriber.scheduled = false;
+  if (!subscriber.active || subscriber.pending.length === 0) return;
+
+  const events = subscriber.pending;
+  const dropped = subscriber.dropped;
+  subscriber.pending = [];
+  subscriber.dropped = 0;
+  subscriber.handler(events, { dropped });
+};
+
+const enqueue = (subscriber, events) => {
+  subscriber.pending.push(...events);
+  const overflow = subscriber.pending.length - subscriber.maxPending;
+  if (overflow > 0) {
+    subscriber.pending.splice(0, overflow);
+    subscriber.dropped += overflow;
+  }
+  if (!subscriber.scheduled) {
+    subscriber.scheduled = true;
+    setTimeout(() => flush(subscriber), 0);
+  }
+};
+
+/**
+ * Deliver events to every subscriber of a topic
+ * @param {string} name - Topic name
+ * @param {...any} events - Events to deliver
+ */
+export const publish = (name, ...events) => {
+  const topic = topics.get(name);
+  if (!topic || events.length === 0) return;
+  topic.subscribers.forEach(subscriber => enqueue(subscriber, events));
+};
+
+// Turn a poll result into delta events.
+// Keyed sources (getKey) emit only items not seen in the previous poll; other
+// sources emit the whole value, but only when it differs from the last one.
+const applyPollResult = (topic, result) => {
+  const { getKey } = topic.source;
+
+  if (getKey) {
+    const items = Array.isArray(result) ? result : [];
+    const fresh = items.filter(item => !topic.seenKeys.has(getKey(item)));
+    topic.seenKeys = new Set(items.map(getKey));
+    topic.snapshot = items;
+    publish(topic.name, ...fresh);
+    return;
+  }
+
+  const signature = JSON.stringify(result);
+  if (signature === topic.signature) return;
+  topic.signature = signature;
+  topic.snapshot = [result];
+  publish(topic.name, result);
+};
+
+const pollTopic = async (topic) => {
+  if (!topic.source || topic.inFlight || isHidden() || isStreamOpen()) return;
+
+  topic.inFlight = true;
+  try {
+    applyPollResult(topic, await topic.source.poll());
+  } catch (error) {
+    console.error(`Event hub poll failed for ${topic.name}:`, error);
+    topic.subscribers.forEach(subscriber => subscriber.onError?.(error));
+  } finally {
+    topic.inFlight = false;
+  }
+};
+
+const listenForVisibility = () => {
+  if (visibilityListening || typeof document === 'undefined') return;
+  visibilityListening = true;
+
+  // Catch up as soon as the tab becomes visible again
+  document.addEventListener('visibilitychange', () => {
+    if (!isHidden()) {
+      topics.forEach(topic => pollTopic(topic));
+    }
+  });
+};
+
+/**
+ * Subscribe to a topic
+ * @param {string} name - Topic name; subscribers sharing a name share one poller
+ * @param {object|null} source - { poll, intervalMs, getKey } or null to only receive published events
+ * @param {function} handler - Called with (events, { dropped }) whenever something changed
+ * @param {object} options - { onError, maxPending }
+ * @returns {function} - Unsubscribe
+ */
+export const subscribe = (name, source, handler, options = {}) => {
+  const topic = getTopic(name);
+  const subscriber = {
+    handler,
+    onError: options.onError,
+    maxPending: options.maxPending || DEFAULT_MAX_PENDING,
+    pending: [],
+    dropped: 0,
+    scheduled: false,
+    active: true,
+  };
+  topic.subscribers.add(subscriber);
+
+  // Late subscribers start from the current state
+  if (topic.snapshot.length > 0) {
+    enqueue(subscriber, topic.snapshot);
+  }
+
+  if (source) {
+    topic.source = source;
+    if (!topic.timer) {
+      listenForVisibility();
+      topic.timer = setInterval(() => pollTopic(topic), source.intervalMs || DEFAULT_INTERVAL_MS);
+      pollTopic(topic);
+    }
+  }
+
+  return () => {
+    subscriber.active = false;
+    topic.subscribers.delete(subscriber);
+    if (topic.subscribers.size === 0) {
+      clearInterval(topic.timer);
+      topics.delete(name);
+    }
+  };
+};
+
+/**
+ * Poll a topic now instead of waiting for the next interval
+ */
+export const refresh = (name) => {
+  const topic = topics.get(name);
+  if (topic) pollTopic(topic);
+};
+
+/**
+ * Receive events from a server-sent events stream
+ * Messages are JSON { topic, data }. The browser resends the last event id on
+ * reconnect, so the server can resume from that cursor and send only deltas.
+ * @param {string} url - Stream URL
+ * @returns {EventSource|null}
+ */
+export const connectEventStream = (url) => {
+  if (stream || typeof EventSource === 'undefined') return stream;
+
+  stream = new EventSource(url);
+  stream.onmessage = (message) => {
+    try {
+      const { topic, data } = JSON.parse(message.data);
+      publish(topic, data);
+    } catch (error) {
+      console.error('Invalid event stream message:', error);
+    }
+  };
+
+  return stream;
+};
+
+export const disconnectEventStream = () => {
+  if (stream) {
+    stream.close();
+    stream = null;
+  }
+};
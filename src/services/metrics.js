@@ -0,0 +1,145 @@
+// src/services/metrics.js
+// In-tab performance metrics. Latencies go into log-linear histograms (HDR
+// style: 16 linear sub-buckets per power of two, so any percentile is within
+// about 6% of the true value), which cost one array increment per sample and
+// a fixed 1.8 KB per histogram however many samples are recorded.
+// Counters track request volume, errors and server-reported query counts.
+// getMetricsSnapshot() is what SystemHealth charts.
+
+const SUB_BUCKET_BITS = 4;
+const SUB_BUCKETS = 1 << SUB_BUCKET_BITS;
+const MAX_EXPONENT = 30;  // 2^31 µs, about 35 minutes
+const BUCKET_COUNT = (MAX_EXPONENT - SUB_BUCKET_BITS + 2) * SUB_BUCKETS;
+
+const histograms = new Map();
+const counters = new Map();
+let profilingSampleRate = 0;
+
+// Bucket index for a value in microseconds
+const bucketIndex = (micros) => {
+  const value = Math.min(Math.max(Math.round(micros), 0), 2 ** (MAX_EXPONENT + 1) - 1);
+  if (value < SUB_BUCKETS) return value;
+  const exponent = 31 - Math.clz32(value);
+  const shift = exponent - SUB_BUCKET_BITS;
+  return (shift + 1) * SUB_BUCKETS + ((value >> shift) - SUB_BUCKETS);
+};
+
+// Midpoint of a bucket, in microseconds
+const bucketValue = (index) => {
+  if (index < SUB_BUCKETS) return index;
+  const shift = Math.floor(index / SUB_BUCKETS) - 1;
+  const low = ((index % SUB_BUCKETS) + SUB_BUCKETS) * 2 ** shift;
+  return low + (2 ** shift - 1) / 2;
+};
+
+const getHistogram = (name) => {
+  let histogram = histograms.get(name);
+  if (!histogram) {
+    histogram = { counts: new Uint32Array(BUCKET_COUNT), count: 0, sum: 0, max: 0 };
+    histograms.set(name, histogram);
+  }
+  return histogram;
+};
+
+const percentile = (histogram, fraction) => {
+  const target = Math.ceil(histogram.count * fraction);
+  let seen = 0;
+  for (let i = 0; i < BUCKET_COUNT; i++) {
+    seen += histogram.counts[i];
+    if (seen >= target) return Math.min(bucketValue(i), histogram.max) / 1000;
+  }
+  return histogram.max / 1000;
+};
+
+/**
+ * Record one latency sample
+ * @param {string} name - e.g. 'api GET /api/investments/policies/' or 'stage fetchUsers'
+ * @param {number} ms - Duration in milliseconds
+ */
+export const recordLatency = (name, ms) => {
+  const micros = ms * 1000;
+  const histogram = getHistogram(name);
+  histogram.counts[bucketIndex(micros)] += 1;
+  histogram.count += 1;
+  histogram.sum += micros;
+  if (micros > histogram.max) histogram.max = micros;
+};
+
+export const incrementCounter = (name, by = 1) => {
+  counters.set(name, (counters.get(name) || 0) + by);
+};
+
+/**
+ * Time an async stage and record it under `stage <name>`
+ * @returns {Promise<*>} - Whatever fn resolves to
+ */
+export const timeStage = async (name, fn) => {
+  const started = performance.now();
+  try {
+    return await fn();
+  } finally {
+    recordLatency(`stage ${name}`, performance.now() - started);
+  }
+};
+
+/**
+ * Opt in to profiling batch job items
+ * A sampled item is also written as a performance.measure entry, so it shows
+ * up in the browser profiler's timeline. 0 (the default) turns this off.
+ * @param {number} rate - Fraction of items to sample, 0..1
+ */
+export const setProfilingSampleRate = (rate) => {
+  profilingSampleRate = Math.min(Math.max(rate, 0), 1);
+};
+
+/**
+ * Run one batch job item, profiling it if it is sampled
+ */
+export const profileBatchItem = async (name, fn) => {
+  if (profilingSampleRate === 0 || Math.random() >= profilingSampleRate) return fn();
+
+  const started = performance.now();
+  try {
+    return await fn();
+  } finally {
+    const elapsed = performance.now() - started;
+    recordLatency(`batch ${name}`, elapsed);
+    performance.measure?.(`batch ${name}`, { start: started, duration: elapsed });
+  }
+};
+
+/**
+ * Collapse ids in a URL path so one endpoint maps to one histogram
+ * No route segment of the API contains a digit, so any segment with one
+ * (42, POL-2024-0001, a UUID) is taken for an id; version segments (v1) are kept.
+ * e.g. /api/investments/policies/POL-2024-0001/?x=1 -> /api/investments/policies/:id/
+ */
+export const endpointKey = (url) =>
+  url
+    .split('?')[0]
+    .replace(/\/[0-9a-f]{8}-[0-9a-f-]{27,}(?=\/|$)/gi, '/:id')
+    .replace(/\/(?!v\d+(?:\/|$))[^/]*\d[^/]*(?=\/|$)/g, '/:id');
+
+/**
+ * Current metrics: latency summaries (ms) sorted by p95, and counters
+ * @returns {object} - { latencies: [{ name, count, mean, p50, p95, p99, max }], counters: {} }
+ */
+export const getMetricsSnapshot = () => ({
+  latencies: [...histograms]
+    .map(([name, histogram]) => ({
+      name,
+      count: histogram.count,
+      mean: histogram.sum / histogram.count / 1000,
+      p50: percentile(histogram, 0.5),
+      p95: percentile(histogram, 0.95),
+      p99: percentile(histogram, 0.99),
+      max: histogram.max / 1000,
+    }))
+    .sort((a, b) => b.p95 - a.p95),
+  counters: Object.fromEntries(counters),
+});
+
+export const resetMetrics = () => {
+  histograms.clear();
+  counters.clear();
+};
@@ -0,0 +1,191 @@
+// Resumable batch jobs
+// Runs an async task for every item with a bounded number in flight, and
+// checkpoints each finished result in IndexedDB under the job key. Running the
+// same job again (e.g. after the tab crashed or was closed) only processes the
+// items that have not finished yet. Checkpoints are timestamped, so abandoned
+// jobs can be expired with expireBatchJobs().
+
+import { profileBatchItem } from '../services/metrics';
+
+const DB_NAME = 'finance-manager-jobs';
+const STORE_NAME = 'checkpoints';
+
+const requestToPromise = (request) =>
+  new Promise((resolve, reject) => {
+    request.onsuccess = () => resolve(request.result);
+    request.onerror = () => reject(request.error);
+  });
+
+// One connection per tab, shared by every job and helper. It is closed when
+// another tab needs to upgrade the database (so the upgrade is not blocked)
+// and reopened on the next call.
+let databasePromise = null;
+
+const openDatabase = () => {
+  if (!databasePromise) {
+    const request = indexedDB.open(DB_NAME, 1);
+    request.onupgradeneeded = () => {
+      const store = request.result.createObjectStore(STORE_NAME, { keyPath: 'id' });
+      store.createIndex('job', 'job');
+    };
+    databasePromise = requestToPromise(request).then(db => {
+      db.onversionchange = () => {
+        db.close();
+        databasePromise = null;
+      };
+      db.onclose = () => {
+        databasePromise = null;
+      };
+      return db;
+    });
+    databasePromise.catch(() => {
+      databasePromise = null;
+    });
+  }
+  return databasePromise;
+};
+
+// Checkpoint store for one job; falls back to memory without IndexedDB
+const openCheckpoints = async (jobKey) => {
+  if (typeof indexedDB === 'undefined') {
+    const memory = new Map();
+    return {
+      loadAll: async () => memory,
+      save: async (key, result) => { memory.set(key, result); },
+      clear: async () => memory.clear(),
+    };
+  }
+
+  const db = await openDatabase();
+  const transaction = (mode) => db.transaction(STORE_NAME, mode).objectStore(STORE_NAME);
+
+  return {
+    loadAll: async () => {
+      const rows = await requestToPromise(transaction('readonly').index('job').getAll(jobKey));
+      return new Map(rows.map(row => [row.key, row.result]));
+    },
+    save: (key, result) =>
+      requestToPromise(transaction('readwrite').put({
+        id: `${jobKey}:${key}`,
+        job: jobKey,
+        key,
+        result,
+        savedAt: Date.now(),
+      })),
+    clear: async () => {
+      const store = transaction('readwrite');
+      const ids = await requestToPromise(store.index('job').getAllKeys(jobKey));
+      await Promise.all(ids.map(id => requestToPromise(store.delete(id))));
+    },
+  };
+};
+
+/**
+ * Run a resumable batch job
+ * @param {object} job - { jobKey, name, items, getKey, run, concurrency, onProgress }
+ *   run(item) returns the result to checkpoint; onProgress(done, total) is
+ *   called after every item, including ones restored from a checkpoint.
+ *   At most `concurrency` items run at once. `name` labels sampled items when batch profiling is on.
+ * @returns {Promise<object>} - { results: Map(key -> result) in item order, failed: [{ item, error }] }
+ */
+export async function runBatchJob({
+  jobKey,
+  name = jobKey,
+  items,
+  getKey,
+  run,
+  concurrency = 4,
+  onProgress,
+}) {
+  const checkpoints = await openCheckpoints(jobKey);
+  const completed = await checkpoints.loadAll();
+  const pending = items.filter(item => !completed.has(getKey(item)));
+  const failed = [];
+  let done = items.length - pending.length;
+  let next = 0;
+
+  if (onProgress) onProgress(done, items.length);
+
+  const worker = async () => {
+    while (next < pending.length) {
+      const item = pending[next++];
+      try {
+        const result = await profileBatchItem(name, () => run(item));
+        completed.set(getKey(item), result);
+        await checkpoints.save(getKey(item), result);
+      } catch (error) {
+        failed.push({ item, error });
+      }
+      done += 1;
+      if (onProgress) onProgress(done, items.length);
+    }
+  };
+
+  await Promise.all(Array.from({ length: Math.min(concurrency, pending.length) }, worker));
+
+  const results = new Map();
+  items.forEach(item => {
+    const key = getKey(item);
+    if (completed.has(key)) results.set(key, completed.get(key));
+  });
+  return { results, failed };
+}
+
+/**
+ * Drop the checkpoints of a finished job
+ */
+export async function clearBatchJob(jobKey) {
+  const checkpoints = await openCheckpoints(jobKey);
+  await checkpoints.clear();
+}
+
+/**
+ * Keys of jobs that have checkpoints, in key order
+ * @param {string} prefix - Only keys starting with this
+ * @returns {Promise<string[]>}
+ */
+export async function listBatchJobs(prefix = '') {
+  if (typeof indexedDB === 'undefined') return [];
+
+  const db = await openDatabase();
+  const index = db.transaction(STORE_NAME, 'readonly').objectStore(STORE_NAME).index('job');
+  const cursor = index.openKeyCursor(IDBKeyRange.bound(prefix, `${prefix}\uffff`), 'nextunique');
+  const keys = [];
+
+  return new Promise((resolve, reject) => {
+    cursor.onsuccess = () => {
+      if (!cursor.result) {
+        resolve(keys);
+        return;
+      }
+      keys.push(cursor.result.key);
+      cursor.result.continue();
+    };
+    cursor.onerror = () => reject(cursor.error);
+  });
+}
+
+/**
+ * Drop checkpoints saved more than maxAgeMs ago, so results of jobs that were
+ * never finished do not stay in IndexedDB indefinitely
+ * @param {number} maxAgeMs - Age limit in milliseconds
+ */
+export async function expireBatchJobs(maxAgeMs) {
+  if (typeof indexedDB === 'undefined') return;
+
+  const db = await openDatabase();
+  const cutoff = Date.now() - maxAgeMs;
+  const cursor = db.transaction(STORE_NAME, 'readwrite').objectStore(STORE_NAME).openCursor();
+
+  await new Promise((resolve, reject) => {
+    cursor.onsuccess = () => {
+      if (!cursor.result) {
+        resolve();
+        return;
+      }
+      if (!(cursor.result.value.savedAt >= cutoff)) cursor.result.delete();
+      cursor.result.continue();
+    };
+    cursor.onerror = () => reject(cursor.error);
+  });
+}
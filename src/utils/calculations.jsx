@@ -27,3 +27,262 @@ export function compoundInterest(principal, rate, months, withdrawals = []) {
 // Example usage for dummy data:
 // const result = compoundInterest(500000, 39.6, 6, [0,0,0,0,0,0]);
 // result.history gives month-by-month breakdown
+
+// Months without a withdrawal after which a policy earns the annual ROI
+export const ANNUAL_ROI_QUALIFYING_MONTHS = 12;
+
+// Annual ROI (percent of principal) for a policy that qualifies
+export const ANNUAL_ROI_RATE = 40;
+
+const DASH = 45;
+
+const readDigits = (text, start, count) => {
+  let value = 0;
+  for (let i = start; i < start + count; i++) value = value * 10 + text.charCodeAt(i) - 48;
+  return value;
+};
+
+// Whole calendar months from a date to `to` (0 if the date is later). API
+// dates are ISO strings (YYYY-MM-DD...), which are read digit by digit rather
+// than through Date, as this runs once per policy.
+const monthsBetween = (from, to) => {
+  let year, month, day;
+  if (typeof from === 'string' && from.charCodeAt(4) === DASH && from.charCodeAt(7) === DASH) {
+    year = readDigits(from, 0, 4);
+    month = readDigits(from, 5, 2) - 1;
+    day = readDigits(from, 8, 2);
+  } else {
+    const start = new Date(from);
+    if (Number.isNaN(start.getTime())) return 0;
+    year = start.getFullYear();
+    month = start.getMonth();
+    day = start.getDate();
+  }
+  let months = (to.getFullYear() - year) * 12 + to.getMonth() - month;
+  if (to.getDate() < day) months -= 1;
+  return Math.max(months, 0);
+};
+
+// Turn policy records (as returned by /api/investments/policies/) into the
+// columnar shape used by accrueRoiBatch. The months since the last withdrawal
+// are counted up to `asOf`, from last_withdrawal_date or, for a policy that
+// never withdrew, from start_date.
+export function policiesToAccrualColumns(policies, asOf = new Date()) {
+  const n = policies.length;
+  const principal = new Float64Array(n);
+  const rate = new Float64Array(n);
+  const roiBalance = new Float64Array(n);
+  const monthsSinceWithdrawal = new Int32Array(n);
+  const onDemand = new Uint8Array(n);
+  for (let i = 0; i < n; i++) {
+    const policy = policies[i];
+    principal[i] = parseFloat(policy.principal_amount || 0);
+    rate[i] = parseFloat(policy.roi_rate || 0);
+    roiBalance[i] = parseFloat(policy.roi_balance || 0);
+    const since = policy.last_withdrawal_date || policy.start_date;
+    monthsSinceWithdrawal[i] = since ? monthsBetween(since, asOf) : 0;
+    onDemand[i] = policy.roi_frequency === 'on_demand' ? 1 : 0;
+  }
+  return { principal, rate, roiBalance, monthsSinceWithdrawal, onDemand };
+}
+
+// Accrue ROI for a whole book of policies at once.
+// Policies are held as columns (principal[i], rate[i]) and advanced month by
+// month with exactly the arithmetic of compoundInterest, but without building
+// a history object per policy per month. `withdrawals` is an optional
+// month-major Float64Array of length months * n (withdrawals[m * n + i] is the
+// amount policy i withdraws in month m + 1).
+// The optional columns from policiesToAccrualColumns carry history into the
+// run: roiBalance is the ROI already accrued, monthsSinceWithdrawal seeds the
+// 12-month counter (so a one-month month-end run still sees a policy's past),
+// and onDemand marks policies whose ROI is only paid out on request.
+// Returns, per policy:
+// - monthlyDue: the last month's interest, payable on monthly-frequency
+//   policies (0 for on-demand ones, whose ROI stays in roiBalance)
+// - annualRoi: ANNUAL_ROI_RATE of the principal for policies that reached
+//   ANNUAL_ROI_QUALIFYING_MONTHS without a withdrawal, else 0
+// Pass { postings: true } to also get the month-by-month ledger postings as
+// columns (the same rows compoundInterest puts in `history`).
+export function accrueRoiBatch({
+  principal,
+  rate,
+  withdrawals = null,
+  roiBalance: openingRoiBalance = null,
+  monthsSinceWithdrawal: openingMonths = null,
+  onDemand = null,
+}, months, options = {}) {
+  const n = principal.length;
+  const balance = Float64Array.from(principal);
+  const monthlyRate = new Float64Array(n);
+  for (let i = 0; i < n; i++) {
+    monthlyRate[i] = rate[i] / 12 / 100;
+  }
+
+  const interestAccrued = new Float64Array(n);
+  const lastInterest = new Float64Array(n);
+  const totalWithdrawn = new Float64Array(n);
+  const monthsSinceWithdrawal = openingMonths ? Int32Array.from(openingMonths) : new Int32Array(n);
+
+  const rows = options.postings ? n * months : 0;
+  const postings = options.postings ? {
+    policy: new Int32Array(rows),
+    month: new Int32Array(rows),
+    interest: new Float64Array(rows),
+    withdrawn: new Float64Array(rows),
+    balance: new Float64Array(rows),
+  } : null;
+
+  for (let m = 0; m < months; m++) {
+    const offset = m * n;
+    for (let i = 0; i < n; i++) {
+      const interest = balance[i] * monthlyRate[i];
+      const withdrawn = withdrawals ? withdrawals[offset + i] : 0;
+      lastInterest[i] = interest;
+
+      if (postings) {
+        postings.policy[offset + i] = i;
+        postings.month[offset + i] = m + 1;
+        postings.interest[offset + i] = interest;
+      }
+
+      // If withdrawal for this month, do not compound
+      if (withdrawn > 0) {
+        if (postings) {
+          postings.withdrawn[offset + i] = withdrawn;
+          postings.balance[offset + i] = balance[i];
+        }
+        balance[i] -= withdrawn;
+        totalWithdrawn[i] += withdrawn;
+        monthsSinceWithdrawal[i] = 0;
+      } else {
+        balance[i] += interest;
+        interestAccrued[i] += interest;
+        monthsSinceWithdrawal[i] += 1;
+        if (postings) {
+          postings.balance[offset + i] = balance[i];
+        }
+      }
+    }
+  }
+
+  const roiBalance = new Float64Array(n);
+  const monthlyDue = new Float64Array(n);
+  const annualRoiEligible = new Uint8Array(n);
+  const annualRoi = new Float64Array(n);
+  for (let i = 0; i < n; i++) {
+    roiBalance[i] = (openingRoiBalance ? openingRoiBalance[i] : 0) + interestAccrued[i];
+    monthlyDue[i] = onDemand && onDemand[i] ? 0 : lastInterest[i];
+    if (monthsSinceWithdrawal[i] >= ANNUAL_ROI_QUALIFYING_MONTHS) {
+      annualRoiEligible[i] = 1;
+      annualRoi[i] = principal[i] * ANNUAL_ROI_RATE / 100;
+    }
+  }
+
+  return {
+    balance,
+    interestAccrued,
+    roiBalance,
+    monthlyDue,
+    totalWithdrawn,
+    monthsSinceWithdrawal,
+    annualRoiEligible,
+    annualRoi,
+    postings,
+  };
+}
+
+// Growth factors (1 + monthlyRate)^months are shared by every projection at
+// the same rate, so keep the most recently used ones around
+const GROWTH_FACTOR_CACHE_SIZE = 1024;
+const growthFactorCache = new Map();
+
+// Compounding factor for `months` withdrawal-free months at an annual `rate`
+export function growthFactor(rate, months) {
+  const key = `${rate}:${months}`;
+  const cached = growthFactorCache.get(key);
+  if (cached !== undefined) {
+    // Re-insert so the Map's insertion order doubles as LRU order
+    growthFactorCache.delete(key);
+    growthFactorCache.set(key, cached);
+    return cached;
+  }
+
+  const factor = Math.pow(1 + rate / 12 / 100, months);
+  growthFactorCache.set(key, factor);
+  if (growthFactorCache.size > GROWTH_FACTOR_CACHE_SIZE) {
+    growthFactorCache.delete(growthFactorCache.keys().next().value);
+  }
+  return factor;
+}
+
+// Balance after `months` months, computed in closed form.
+// The timeline is split at withdrawal months; each withdrawal-free stretch is
+// a single multiplication by its growth factor, so the cost depends on the
+// number of withdrawals rather than the number of months. Agrees with
+// compoundInterest up to floating-point rounding.
+export function projectBalance(principal, rate, months, withdrawals = []) {
+  let balance = principal;
+  let month = 0;
+  const last = Math.min(months, withdrawals.length);
+
+  for (let m = 1; m <= last; m++) {
+    const withdrawn = withdrawals[m - 1] || 0;
+    if (withdrawn > 0) {
+      balance *= growthFactor(rate, m - 1 - month);
+      balance -= withdrawn;
+      month = m;
+    }
+  }
+
+  return balance * growthFactor(rate, months - month);
+}
+
+// Incremental projection for a single policy.
+// Holds the balance at the last projected month as a checkpoint, so
+// "extend by one month" is constant time instead of replaying history.
+export class RoiProjection {
+  constructor(principal, rate, checkpoint = null) {
+    this.rate = rate;
+    this.monthlyRate = rate / 12 / 100;
+    this.month = checkpoint ? checkpoint.month : 0;
+    this.balance = checkpoint ? checkpoint.balance : principal;
+  }
+
+  // Advance one month, with the same rules as compoundInterest
+  extend(withdrawn = 0) {
+    const interest = this.balance * this.monthlyRate;
+    this.month += 1;
+
+    if (withdrawn > 0) {
+      const entry = { month: this.month, interest, withdrawn, balance: this.balance };
+      this.balance -= withdrawn;
+      return entry;
+    }
+
+    this.balance += interest;
+    return { month: this.month, interest, withdrawn: 0, balance: this.balance };
+  }
+
+  // Advance `months` withdrawal-free months in closed form
+  skip(months) {
+    this.balance *= growthFactor(this.rate, months);
+    this.month += months;
+    return this.balance;
+  }
+
+  checkpoint() {
+    return { month: this.month, balance: this.balance };
+  }
+}
+
+// Month-by-month balance curve (e.g. a 30-year what-if chart).
+// Built from one RoiProjection, so each point costs O(1).
+export function projectionCurve(principal, rate, months, withdrawals = []) {
+  const projection = new RoiProjection(principal, rate);
+  const curve = new Float64Array(months);
+  for (let m = 0; m < months; m++) {
+    projection.extend(withdrawals[m] || 0);
+    curve[m] = projection.balance;
+  }
+  return curve;
+}
@@ -0,0 +1,146 @@
+// Investor directory
+// Builds the user list the admin dashboard works from by joining users with
+// their policies. Kept free of React and fetching so it can be reused and
+// benchmarked on synthetic data (see scripts/bench).
+
+import { toKobo, fromKobo } from './money';
+import { calculateNextRoiDate } from './roiDueIndex';
+
+/**
+ * Join users with their policies and split them by role
+ * @param {object[]} allUsers - Users from /api/user/users/
+ * @param {object[]} allPolicies - Policies from /api/investments/policies/
+ * @returns {object} - { staff, investors, potentialInvestors }
+ */
+export function buildDirectory(allUsers, allPolicies) {
+  // Group policies by user and total them in a single pass (in kobo, so
+  // totals are exact)
+  const policiesByUser = new Map();
+  allPolicies.forEach(policy => {
+    const userId = policy.user_details?.id;
+    if (!userId) return;
+
+    let group = policiesByUser.get(userId);
+    if (!group) {
+      group = { policies: [], totalPrincipal: 0, totalRoiBalance: 0, totalBalance: 0 };
+      policiesByUser.set(userId, group);
+    }
+    group.policies.push(policy);
+    group.totalPrincipal += toKobo(policy.principal_amount);
+    group.totalRoiBalance += toKobo(policy.roi_balance);
+    group.totalBalance += toKobo(policy.total_balance);
+  });
+
+  const mappedUsers = allUsers.map((u) => {
+    // Get policies and totals for this user
+    const {
+      policies: userPolicies,
+      totalPrincipal,
+      totalRoiBalance,
+      totalBalance,
+    } = policiesByUser.get(u.id) || { policies: [], totalPrincipal: 0, totalRoiBalance: 0, totalBalance: 0 };
+
+    // Get investment details from profile (legacy)
+    const investmentDetails = u.profile?.investment_details || [];
+    
+    // Map policies to investments format
+    const investments = userPolicies.map(policy => ({
+      id: policy.id,
+      policy_number: policy.policy_number,
+      investment_amount: policy.principal_amount,
+      remaining_balance: policy.current_balance,
+      roi_rate: policy.roi_rate,
+      investment_start_date: policy.start_date,
+      status: policy.status
+    }));
+
+    // Get withdrawals from user profile
+    const withdrawals = u.profile?.withdrawal_details || [];
+
+    // Get primary policy for ROI due date
+    const primaryPolicy = userPolicies[0];
+    const nextRoiDate = primaryPolicy?.roi_frequency === 'monthly' 
+      ? calculateNextRoiDate(primaryPolicy?.start_date)
+      : 'On Demand';
+
+    return {
+      id: u.id,
+      date: u.date_joined?.split('T')[0] || new Date().toISOString().split('T')[0],
+      uniquePolicy: primaryPolicy?.policy_number || 
+                   u.profile?.policy_number || 
+                   `PRO-${u.id.toString().padStart(6, '0')}`,
+      name: `${u.first_name || ''} ${u.last_name || ''}`.trim() || u.email,
+      email: u.email,
+      phoneNumber: u.profile?.work_phone || u.profile?.personal_phone || 'N/A',
+      role: u.role,
+      job_role: u.job_role,
+      department: u.profile?.department || 'N/A',
+      status: u.status,
+      address: `${u.profile?.street || ''}, ${u.profile?.city || ''}`.trim() || 'N/A',
+      dateOfBirth: u.profile?.dob || 'N/A',
+      gender: u.profile?.gender || 'N/A',
+      firstName: u.first_name || '',
+      surname: u.last_name || '',
+      otherName: u.middle_name || '',
+      residentialAddress: u.profile?.residential_address || 'N/A',
+      homeAddress: u.profile?.home_address || 'N/A',
+      sex: u.profile?.gender || 'N/A',
+      qualifications: u.profile?.professional_qualifications?.map(q => q.name) || [],
+      emergencyContact: {
+        name: u.profile?.next_of_kin || 'N/A',
+        phone: u.profile?.next_of_kin_phone_number || 'N/A',
+        relationship: u.profile?.relationship_to_next_of_kin || 'N/A',
+      },
+      kycStatus: u.profile?.kyc_status || 'Pending',
+      roiFrequency: primaryPolicy?.roi_frequency || u.profile?.roi_frequency || 'monthly',
+      policyDate: primaryPolicy?.start_date || 
+                 u.profile?.policy_date || 
+                 u.date_joined?.split('T')[0] || 
+                 new Date().toISOString().split('T')[0],
+      
+      // Investment amounts from policies
+      investmentAmount: fromKobo(totalPrincipal),
+      remainingBalance: fromKobo(totalBalance),
+      roiDue: fromKobo(totalRoiBalance),
+      roiDueDate: nextRoiDate,
+      
+      // Bank details
+      disbursementBank: u.profile?.bank_name || 'N/A',
+      accountName: u.profile?.account_name || 'N/A',
+      accountNumber: u.profile?.account_number || 'N/A',
+      
+      // Next of kin
+      nextOfKinName: u.profile?.next_of_kin_name || 'N/A',
+      nextOfKinAddress: u.profile?.next_of_kin_address || 'N/A',
+      nextOfKinPhone: u.profile?.next_of_kin_phone || 'N/A',
+      nextOfKinSex: u.profile?.next_of_kin_sex || 'N/A',
+      
+      // Additional fields
+      referredBy: u.profile?.referred_by || 'N/A',
+      signatureDate: u.profile?.signature_date || 'N/A',
+      passportPhoto: u.profile?.passport_photo,
+      investorSignature: u.profile?.investor_signature,
+      directorSignature: u.profile?.director_signature,
+      
+      // Investment and withdrawal arrays
+      investments: investments,
+      withdrawals: withdrawals,
+      
+      // All user policies
+      policies: userPolicies,
+
+      // Include full profile for access to investment_details
+      profile: u.profile,
+    };
+  });
+
+  const sortedStaff = mappedUsers.filter(u => u.role === 'staff');
+  const sortedInvestors = mappedUsers.filter(u => u.role === 'investor');
+  const sortedPotentialInvestors = mappedUsers.filter(u => u.role === 'user');
+
+  return {
+    staff: sortedStaff,
+    investors: sortedInvestors,
+    potentialInvestors: sortedPotentialInvestors,
+  };
+}
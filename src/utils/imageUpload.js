@@ -0,0 +1,73 @@
+// Image upload helpers
+// Photos and scanned documents are downscaled and re-encoded in the browser
+// before upload, so the registration and KYC endpoints receive a few hundred
+// KB instead of multi-megabyte camera images.
+
+import { timeStage } from '../services/metrics';
+
+export const MAX_UPLOAD_DIMENSION = 1200;
+export const UPLOAD_JPEG_QUALITY = 0.85;
+
+// Only formats the forms already accept are re-encoded; anything else is left
+// alone so form validation still rejects it
+const RESIZABLE_TYPES = ['image/jpeg', 'image/png'];
+
+const canResize = () =>
+  typeof createImageBitmap === 'function' &&
+  (typeof OffscreenCanvas === 'function' || typeof document !== 'undefined');
+
+// JPEG has no alpha channel, so flatten transparent PNGs onto white
+const paint = (ctx, bitmap, width, height) => {
+  ctx.fillStyle = '#ffffff';
+  ctx.fillRect(0, 0, width, height);
+  ctx.drawImage(bitmap, 0, 0, width, height);
+};
+
+const drawToBlob = async (bitmap, width, height, quality) => {
+  if (typeof OffscreenCanvas === 'function') {
+    const canvas = new OffscreenCanvas(width, height);
+    paint(canvas.getContext('2d'), bitmap, width, height);
+    return canvas.convertToBlob({ type: 'image/jpeg', quality });
+  }
+
+  const canvas = document.createElement('canvas');
+  canvas.width = width;
+  canvas.height = height;
+  paint(canvas.getContext('2d'), bitmap, width, height);
+  return new Promise(resolve => canvas.toBlob(resolve, 'image/jpeg', quality));
+};
+
+/**
+ * Downscale and re-encode an image file for upload
+ * Returns the original file when it is not a JPEG/PNG, cannot be decoded, or
+ * when re-encoding would not make it smaller.
+ * @param {File} file - Selected file
+ * @param {object} options - { maxDimension, quality }
+ * @returns {Promise<File>}
+ */
+export async function prepareImageUpload(file, options = {}) {
+  if (!file || !RESIZABLE_TYPES.includes(file.type) || !canResize()) return file;
+
+  const { maxDimension = MAX_UPLOAD_DIMENSION, quality = UPLOAD_JPEG_QUALITY } = options;
+
+  return timeStage('prepareImageUpload', async () => {
+    try {
+      // createImageBitmap decodes off the main thread
+      const bitmap = await createImageBitmap(file);
+      const scale = Math.min(1, maxDimension / Math.max(bitmap.width, bitmap.height));
+      const width = Math.round(bitmap.width * scale);
+      const height = Math.round(bitmap.height * scale);
+
+      const blob = await drawToBlob(bitmap, width, height, quality);
+      bitmap.close();
+
+      if (!blob || blob.size >= file.size) return file;
+
+      const name = file.name.replace(/\.[^.]+$/, '') + '.jpg';
+      return new File([blob], name, { type: 'image/jpeg', lastModified: file.lastModified });
+    } catch (error) {
+      console.warn('Could not resize image, uploading original:', error);
+      return file;
+    }
+  });
+}
@@ -0,0 +1,159 @@
+// Ledger aggregates
+// Totals overall, per policy, per month and per entry type, built by folding
+// in one entry at a time. The client never sees individual postings, so the
+// aggregates are only rebuilt from the streamed ledger (rebuild()) and
+// compared with the stored summary and per-policy / per-month reports (diff())
+// to catch drift; keeping them running alongside each posting is up to the API.
+// Amounts are accumulated in integer kobo, so totals over any number of
+// entries are exact; toJSON() converts them back to naira.
+
+import { toKobo, fromKobo } from './money';
+
+const MONEY_FIELDS = ['total_inflow', 'total_outflow', 'net_flow'];
+
+const emptyTotals = () => ({ total_inflow: 0, total_outflow: 0, net_flow: 0, entry_count: 0 });
+
+const totalsToNaira = (totals) => ({
+  ...totals,
+  total_inflow: fromKobo(totals.total_inflow),
+  total_outflow: fromKobo(totals.total_outflow),
+  net_flow: fromKobo(totals.net_flow),
+});
+
+const bucketsToNaira = (buckets) =>
+  Object.fromEntries([...buckets].map(([key, totals]) => [key, totalsToNaira(totals)]));
+
+const addToTotals = (totals, inflow, outflow) => {
+  totals.total_inflow += inflow;
+  totals.total_outflow += outflow;
+  totals.net_flow += inflow - outflow;
+  totals.entry_count += 1;
+};
+
+// Mismatches between our totals (kobo) and stored ones; only fields present in
+// both are compared, exactly to the kobo
+const diffTotals = (totals, stored) => {
+  const actual = totalsToNaira(totals);
+  return Object.keys(totals)
+    .filter(field => stored[field] !== undefined && stored[field] !== null)
+    .filter(field => (MONEY_FIELDS.includes(field)
+      ? toKobo(stored[field]) !== totals[field]
+      : Number(stored[field]) !== totals[field]))
+    .map(field => ({
+      field,
+      expected: parseFloat(stored[field]),
+      actual: actual[field],
+    }));
+};
+
+// Stored per-bucket reports arrive either as rows carrying their key
+// (optionally under `results`) or as an object keyed by bucket
+const storedBuckets = (report, keyOf) => {
+  const rows = Array.isArray(report) ? report : report?.results;
+  if (Array.isArray(rows)) {
+    return new Map(rows.map(row => [keyOf(row), row]));
+  }
+  return new Map(Object.entries(report || {}));
+};
+
+const diffBuckets = (scope, buckets, stored) => {
+  const mismatches = [];
+  buckets.forEach((totals, key) => {
+    const row = stored.get(key);
+    if (!row) {
+      mismatches.push({ scope, key, field: 'bucket', expected: 'missing', actual: 'present' });
+      return;
+    }
+    diffTotals(totals, row).forEach(mismatch => mismatches.push({ scope, key, ...mismatch }));
+  });
+  stored.forEach((row, key) => {
+    if (!buckets.has(key)) {
+      mismatches.push({ scope, key, field: 'bucket', expected: 'present', actual: 'missing' });
+    }
+  });
+  return mismatches;
+};
+
+const policyKeyOf = row => String(row.policy_number || row.policy || 'unknown');
+
+const monthKeyOf = row => String(row.month || row.period || 'unknown').slice(0, 7);
+
+const bucketFor = (buckets, key) => {
+  let totals = buckets.get(key);
+  if (!totals) {
+    totals = emptyTotals();
+    buckets.set(key, totals);
+  }
+  return totals;
+};
+
+export class LedgerAggregates {
+  // totals and every bucket hold amounts in kobo
+  constructor() {
+    this.totals = emptyTotals();
+    this.byPolicy = new Map();
+    this.byMonth = new Map();
+    this.byEntryType = new Map();
+  }
+
+  /**
+   * Fold a single ledger entry into every aggregate
+   * @param {object} entry - Ledger entry as returned by /api/investments/ledger/
+   */
+  add(entry) {
+    const inflow = toKobo(entry.inflow);
+    const outflow = toKobo(entry.outflow);
+
+    addToTotals(this.totals, inflow, outflow);
+    addToTotals(bucketFor(this.byPolicy, entry.policy_number || entry.policy || 'unknown'), inflow, outflow);
+    addToTotals(bucketFor(this.byMonth, (entry.entry_date || '').slice(0, 7) || 'unknown'), inflow, outflow);
+    addToTotals(bucketFor(this.byEntryType, entry.entry_type || 'unknown'), inflow, outflow);
+  }
+
+  addAll(entries) {
+    entries.forEach(entry => this.add(entry));
+  }
+
+  /**
+   * Recompute aggregates from scratch
+   * @param {AsyncIterable<object[]>} pages - Pages of ledger entries (e.g. streamLedger())
+   * @returns {Promise<LedgerAggregates>}
+   */
+  static async rebuild(pages) {
+    const aggregates = new LedgerAggregates();
+    for await (const rows of pages) {
+      aggregates.addAll(rows);
+    }
+    return aggregates;
+  }
+
+  /**
+   * Compare with the stored summary and, when given, the stored per-policy
+   * and per-month reports
+   * Only fields present in both are compared, exactly to the kobo. A bucket on
+   * one side only is reported with field 'bucket'.
+   * @param {object} summary - Stored summary (e.g. from /ledger/summary/)
+   * @param {object} reports - { byPolicy, byMonth } from /ledger/by_policy/ and /ledger/monthly_report/
+   * @returns {object[]} - [{ scope, key, field, expected, actual }] in naira for every mismatch
+   */
+  diff(summary, { byPolicy = null, byMonth = null } = {}) {
+    const mismatches = diffTotals(this.totals, summary)
+      .map(mismatch => ({ scope: 'summary', key: null, ...mismatch }));
+    if (byPolicy) {
+      mismatches.push(...diffBuckets('by_policy', this.byPolicy, storedBuckets(byPolicy, policyKeyOf)));
+    }
+    if (byMonth) {
+      mismatches.push(...diffBuckets('by_month', this.byMonth, storedBuckets(byMonth, monthKeyOf)));
+    }
+    return mismatches;
+  }
+
+  toJSON() {
+    return {
+      ...totalsToNaira(this.totals),
+      by_policy: bucketsToNaira(this.byPolicy),
+      by_month: bucketsToNaira(this.byMonth),
+      by_entry_type: bucketsToNaira(this.byEntryType),
+    };
+  }
+}
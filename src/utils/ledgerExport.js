@@ -0,0 +1,71 @@
+// Ledger export helpers
+// Ledger pages are converted to CSV one at a time and handed to the browser as
+// Blob parts, so only a single page of entries is ever held in JS memory no
+// matter how large the ledger is.
+
+export const LEDGER_EXPORT_COLUMNS = [
+  { key: 'entry_date', label: 'Date' },
+  { key: 'policy_number', label: 'Policy Number' },
+  { key: 'description', label: 'Description' },
+  { key: 'entry_type', label: 'Type' },
+  { key: 'inflow', label: 'Inflow (₦)' },
+  { key: 'outflow', label: 'Outflow (₦)' },
+  { key: 'principal_balance', label: 'Principal Balance (₦)' },
+  { key: 'roi_balance', label: 'ROI Balance (₦)' },
+  { key: 'total_balance', label: 'Total Balance (₦)' },
+];
+
+// Quote a value for CSV if it contains a delimiter, quote or newline.
+// Text starting with a formula character (e.g. a description of "=HYPERLINK(...)")
+// is prefixed with an apostrophe so spreadsheets show it instead of running it;
+// plain numbers such as "-500.00" are left alone.
+export function toCsvField(value) {
+  if (value === null || value === undefined) return '';
+  let text = String(value);
+  if (/^[=+\-@\t\r]/.test(text) && !/^[+-]?\d+(\.\d+)?$/.test(text)) {
+    text = `'${text}`;
+  }
+  return /[",\r\n]/.test(text) ? `"${text.replace(/"/g, '""')}"` : text;
+}
+
+export function ledgerCsvHeader(columns = LEDGER_EXPORT_COLUMNS) {
+  return columns.map(column => toCsvField(column.label)).join(',') + '\r\n';
+}
+
+export function ledgerRowsToCsv(rows, columns = LEDGER_EXPORT_COLUMNS) {
+  let chunk = '';
+  for (const row of rows) {
+    chunk += columns.map(column => toCsvField(row[column.key])).join(',') + '\r\n';
+  }
+  return chunk;
+}
+
+/**
+ * Write an async iterable of ledger pages into a CSV Blob chunk by chunk
+ * @param {AsyncIterable<object[]>} pages - Pages of ledger entries
+ * @param {function} onProgress - Optional callback receiving the number of rows written so far
+ * @returns {Promise<Blob>}
+ */
+export async function writeLedgerCsv(pages, onProgress) {
+  const parts = [new Blob([ledgerCsvHeader()], { type: 'text/csv' })];
+  let rowsWritten = 0;
+
+  for await (const rows of pages) {
+    parts.push(new Blob([ledgerRowsToCsv(rows)], { type: 'text/csv' }));
+    rowsWritten += rows.length;
+    if (onProgress) onProgress(rowsWritten);
+  }
+
+  return new Blob(parts, { type: 'text/csv;charset=utf-8' });
+}
+
+export function downloadBlob(blob, filename) {
+  const url = URL.createObjectURL(blob);
+  const a = document.createElement('a');
+  a.href = url;
+  a.download = filename;
+  document.body.appendChild(a);
+  a.click();
+  document.body.removeChild(a);
+  URL.revokeObjectURL(url);
+}
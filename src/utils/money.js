@@ -0,0 +1,172 @@
+// Money in integer kobo
+// API amounts arrive as decimal strings ("1250000.50"). Parsing them with
+// parseFloat and adding the floats drifts by fractions of a kobo over many
+// rows, so amounts are converted straight from the string to whole kobo and all
+// arithmetic stays in integers. Integers are exact in a Number up to 2^53
+// (about ₦90 trillion), so columns are packed into Float64Arrays of integers
+// rather than BigInt64Arrays, which would need BigInt arithmetic per element.
+
+const DECIMAL_PATTERN = /^([+-])?(\d*)(?:\.(\d*))?$/;
+const EXPONENT_PATTERN = /^([+-])?(\d*)(?:\.(\d*))?[eE]([+-]?\d+)$/;
+
+// Past this many digits of shift the amount is zero or not finite anyway
+const MAX_EXPONENT = 400;
+
+// Rewrite "2.5e-2" as "0.025" by moving the decimal point in the digits, so the
+// value is rounded from its exact decimal form like any other string
+const expandExponent = ([, sign = '', whole = '', fraction = '', exponent]) => {
+  const shift = Number(exponent);
+  if (shift > MAX_EXPONENT) return null;
+  if (shift < -MAX_EXPONENT) return '0';
+
+  const digits = `${whole}${fraction}`;
+  const point = whole.length + shift;
+  if (point <= 0) return `${sign}0.${'0'.repeat(-point)}${digits}`;
+  if (point >= digits.length) return `${sign}${digits}${'0'.repeat(point - digits.length)}`;
+  return `${sign}${digits.slice(0, point)}.${digits.slice(point)}`;
+};
+
+/**
+ * Integer division rounded half to even (banker's rounding)
+ * @param {number} numerator - Integer
+ * @param {number} denominator - Positive integer
+ * @returns {number}
+ */
+export const divRoundHalfEven = (numerator, denominator) => {
+  const remainder = numerator % denominator;
+  let quotient = (numerator - remainder) / denominator;
+  const twice = 2 * Math.abs(remainder);
+  if (twice > denominator || (twice === denominator && quotient % 2 !== 0)) {
+    quotient += Math.sign(numerator);
+  }
+  return quotient;
+};
+
+const bigDivRoundHalfEven = (numerator, denominator) => {
+  const remainder = numerator % denominator;
+  let quotient = numerator / denominator;
+  const twice = 2n * (remainder < 0n ? -remainder : remainder);
+  if (twice > denominator || (twice === denominator && quotient % 2n !== 0n)) {
+    quotient += numerator < 0n ? -1n : 1n;
+  }
+  return quotient;
+};
+
+/**
+ * Convert an amount in naira to whole kobo without going through a float
+ * Digits past the kobo are rounded half to even.
+ * @param {string|number} value - Decimal string or number, e.g. "1250000.505"
+ * @returns {number} - Integer kobo (NaN when the value is not a number)
+ */
+export const toKobo = (value) => {
+  if (value === null || value === undefined || value === '') return 0;
+
+  const text = typeof value === 'number' ? String(value) : String(value).trim();
+  const match = DECIMAL_PATTERN.exec(text);
+  if (!match || (!match[2] && !match[3])) {
+    const exponent = EXPONENT_PATTERN.exec(text);
+    if (exponent && (exponent[2] || exponent[3])) {
+      const expanded = expandExponent(exponent);
+      return expanded === null ? NaN : toKobo(expanded);
+    }
+    // Anything else parseFloat accepts ("12abc"), rounded from its shortest
+    // decimal form
+    const parsed = parseFloat(text);
+    return Number.isFinite(parsed) ? toKobo(parsed) : NaN;
+  }
+
+  const [, sign, whole = '', fraction = ''] = match;
+  const digits = fraction.padEnd(2, '0');
+  let kobo = Number(whole || 0) * 100 + Number(digits.slice(0, 2));
+
+  const rest = digits.slice(2);
+  if (rest && /[1-9]/.test(rest)) {
+    const firstDropped = Number(rest[0]);
+    const exactlyHalf = firstDropped === 5 && !/[1-9]/.test(rest.slice(1));
+    if (firstDropped > 5 || (firstDropped === 5 && !exactlyHalf) || (exactlyHalf && kobo % 2 !== 0)) {
+      kobo += 1;
+    }
+  }
+
+  return sign === '-' ? -kobo : kobo;
+};
+
+/**
+ * Convert kobo back to naira for display or for APIs that expect numbers
+ */
+export const fromKobo = (kobo) => kobo / 100;
+
+/**
+ * Multiply an amount by a rational rate, rounded half to even to the kobo
+ * e.g. one month of 40% a year: applyRate(kobo, 40, 1200)
+ * @param {number} kobo - Integer kobo
+ * @param {number} numerator - Integer
+ * @param {number} denominator - Positive integer
+ * @returns {number}
+ */
+export const applyRate = (kobo, numerator, denominator = 1) => {
+  const product = kobo * numerator;
+  if (Number.isSafeInteger(product)) {
+    return divRoundHalfEven(product, denominator);
+  }
+  return Number(bigDivRoundHalfEven(BigInt(kobo) * BigInt(numerator), BigInt(denominator)));
+};
+
+/**
+ * Turn a decimal rate ("0.075", 7.5) into an exact integer ratio for applyRate
+ * @returns {object} - { numerator, denominator }
+ */
+export const rateToRatio = (rate) => {
+  const text = typeof rate === 'number' ? String(rate) : String(rate).trim();
+  const match = DECIMAL_PATTERN.exec(text);
+  if (!match) throw new Error(`Invalid rate: ${rate}`);
+
+  const [, sign, whole = '', fraction = ''] = match;
+  const numerator = Number(`${whole}${fraction}` || 0);
+  return { numerator: sign === '-' ? -numerator : numerator, denominator: 10 ** fraction.length };
+};
+
+/**
+ * Pack amounts into a column of integer kobo
+ * @param {Array<string|number>} values - Amounts in naira
+ * @returns {Float64Array}
+ */
+export const toKoboColumn = (values) => {
+  const column = new Float64Array(values.length);
+  for (let i = 0; i < values.length; i++) {
+    column[i] = toKobo(values[i]);
+  }
+  return column;
+};
+
+/**
+ * Exact total of a kobo column
+ * Throws rather than silently losing precision past 2^53 kobo.
+ */
+export const sumKobo = (column) => {
+  let total = 0;
+  for (let i = 0; i < column.length; i++) {
+    total += column[i];
+  }
+  if (!Number.isSafeInteger(total)) {
+    throw new RangeError('Kobo total exceeds the exact integer range');
+  }
+  return total;
+};
+
+/**
+ * Apply one rational rate to every amount in a kobo column
+ */
+export const applyRateColumn = (column, numerator, denominator = 1, out = new Float64Array(column.length)) => {
+  for (let i = 0; i < column.length; i++) {
+    out[i] = applyRate(column[i], numerator, denominator);
+  }
+  return out;
+};
+
+/**
+ * Exact total of amounts in naira, for display totals over API rows
+ * @param {Array<string|number>} values - Decimal strings or numbers; empty values count as 0
+ * @returns {number} - Total in naira, exact to the kobo
+ */
+export const sumAmounts = (values) => fromKobo(sumKobo(toKoboColumn(values)));
@@ -1,6 +1,8 @@
 // Nigerian Tax Calculator Utility
 // Implements Nigerian tax laws for investment management system
 
+import { toKoboColumn, fromKobo, sumKobo, rateToRatio, applyRateColumn } from './money';
+
 export class NigerianTaxCalculator {
 
   // Withholding Tax Rates (as per Nigerian tax law)
@@ -229,6 +231,115 @@ export class NigerianTaxCalculator {
     };
   }
 
+  /**
+   * Build cumulative PIT bracket tables for batch evaluation
+   * thresholds[k] is the income at which bracket k starts to be taxed and
+   * cumulativeTax[k] the tax on all brackets below it, summed in the same
+   * order as calculatePIT so results stay bit-for-bit identical.
+   * @returns {object} - { thresholds, cumulativeTax, rates }
+   */
+  static getPITTable() {
+    if (this._pitTable && this._pitTable.brackets === this.PIT_BRACKETS) {
+      return this._pitTable;
+    }
+
+    const count = this.PIT_BRACKETS.length;
+    const thresholds = new Float64Array(count + 1);
+    const cumulativeTax = new Float64Array(count + 1);
+    const rates = new Float64Array(count);
+
+    this.PIT_BRACKETS.forEach((bracket, k) => {
+      const width = bracket.max - bracket.min + 1;
+      rates[k] = bracket.rate;
+      thresholds[k + 1] = thresholds[k] + width;
+      cumulativeTax[k + 1] = cumulativeTax[k] + width * bracket.rate;
+    });
+
+    this._pitTable = { brackets: this.PIT_BRACKETS, thresholds, cumulativeTax, rates };
+    return this._pitTable;
+  }
+
+  /**
+   * Personal Income Tax for a single income using the cumulative bracket table
+   * @param {number} annualIncome - Annual taxable income
+   * @returns {number} - Tax amount, identical to calculatePIT(annualIncome).taxAmount
+   */
+  static calculatePITAmount(annualIncome) {
+    if (annualIncome <= 0) return 0;
+
+    const { thresholds, cumulativeTax, rates } = this.getPITTable();
+
+    // Last bracket whose threshold lies below the income
+    let lo = 0;
+    let hi = rates.length - 1;
+    while (lo < hi) {
+      const mid = (lo + hi + 1) >> 1;
+      if (thresholds[mid] < annualIncome) {
+        lo = mid;
+      } else {
+        hi = mid - 1;
+      }
+    }
+
+    // Thresholds are integers, so this subtraction is exact and matches the
+    // running remainder in calculatePIT
+    return cumulativeTax[lo] + (annualIncome - thresholds[lo]) * rates[lo];
+  }
+
+  /**
+   * Calculate investment taxes for a whole batch of ROI payments
+   * Applies the same WHT + PIT rules as calculateInvestmentTaxes, but returns
+   * columnar results and only builds a PIT breakdown when asked for one.
+   * ROI amounts may be the API's decimal strings; WHT is computed in kobo and
+   * rounded half to even, so whtTotal is exact however many payments there are.
+   * @param {object} batch - { investorIds, roiAmounts, annualIncomes } (arrays of equal length)
+   * @returns {object} - Columnar results (in naira) plus breakdown(i) for on-demand detail
+   */
+  static calculateInvestmentTaxesBatch({ investorIds = null, roiAmounts, annualIncomes = null }) {
+    const count = roiAmounts.length;
+    const whtRate = this.WHT_RATES.INTEREST || 0;
+    const { numerator, denominator } = rateToRatio(whtRate);
+    const roiKobo = toKoboColumn(roiAmounts);
+    const whtKobo = applyRateColumn(roiKobo, numerator, denominator);
+
+    const whtAmount = new Float64Array(count);
+    const netAfterWHT = new Float64Array(count);
+    const pitIncome = new Float64Array(count);
+    const pitAmount = new Float64Array(count);
+    const totalTax = new Float64Array(count);
+    const effectiveTotalRate = new Float64Array(count);
+    const netAfterAllTaxes = new Float64Array(count);
+
+    for (let i = 0; i < count; i++) {
+      const roiAmount = fromKobo(roiKobo[i]);
+      const annualIncome = annualIncomes ? annualIncomes[i] : 0;
+
+      whtAmount[i] = fromKobo(whtKobo[i]);
+      netAfterWHT[i] = fromKobo(roiKobo[i] - whtKobo[i]);
+      pitIncome[i] = annualIncome + netAfterWHT[i];
+      pitAmount[i] = this.calculatePITAmount(pitIncome[i]);
+      totalTax[i] = whtAmount[i] + pitAmount[i];
+      effectiveTotalRate[i] = roiAmount > 0 ? totalTax[i] / roiAmount : 0;
+      netAfterAllTaxes[i] = roiAmount - totalTax[i];
+    }
+
+    return {
+      count,
+      investorIds,
+      roiAmounts,
+      whtRate,
+      whtAmount,
+      whtTotal: fromKobo(sumKobo(whtKobo)),
+      netAfterWHT,
+      pitIncome,
+      pitAmount,
+      totalTax,
+      effectiveTotalRate,
+      netAfterAllTaxes,
+      breakdown: (i) => this.calculatePIT(pitIncome[i]).breakdown,
+    };
+  }
+
   /**
    * Format currency in Nigerian Naira
    * @param {number} amount - Amount to format
@@ -259,5 +370,6 @@ export const calculateCGT = NigerianTaxCalculator.calculateCGT.bind(NigerianTaxC
 export const calculateVAT = NigerianTaxCalculator.calculateVAT.bind(NigerianTaxCalculator);
 export const calculateInvestmentTaxes = NigerianTaxCalculator.calculateInvestmentTaxes.bind(NigerianTaxCalculator);
 export const generateTaxCertificate = NigerianTaxCalculator.generateTaxCertificate.bind(NigerianTaxCalculator);
+export const calculateInvestmentTaxesBatch = NigerianTaxCalculator.calculateInvestmentTaxesBatch.bind(NigerianTaxCalculator);
 export const formatCurrency = NigerianTaxCalculator.formatCurrency.bind(NigerianTaxCalculator);
 export const formatPercentage = NigerianTaxCalculator.formatPercentage.bind(NigerianTaxCalculator);
\ No newline at end of file
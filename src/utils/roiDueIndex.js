@@ -0,0 +1,184 @@
+// ROI due-date index
+// Monthly-ROI policies are bucketed by their next ROI date (YYYY-MM-DD), with
+// the bucket dates kept sorted, so "who is due today / this week" is a range
+// scan over a few buckets instead of a pass over the whole book. The index is
+// filled from the policy list once per directory load and then updated as
+// individual policies are created or changed. Every change bumps `version` and
+// notifies subscribers, so views reading the index re-render without a refetch.
+
+// Next ROI date per (current month, start-day class); the date only depends on
+// whether the policy started after the 12th, so this holds a handful of entries
+const nextRoiDateCache = new Map();
+
+/**
+ * Calculate next ROI date based on policy start date
+ * Returns next month's 1st if investment was made between 1st-12th
+ * Returns month after next if investment was made after 12th
+ */
+export const calculateNextRoiDate = (startDate) => {
+  if (!startDate) return 'N/A';
+
+  const day = new Date(startDate).getDate();
+  const now = new Date();
+  const key = `${now.getFullYear()}-${now.getMonth()}:${day > 12}`;
+
+  let cached = nextRoiDateCache.get(key);
+  if (!cached) {
+    let nextRoiDate = new Date(now.getFullYear(), now.getMonth() + 1, 1);
+
+    // If investment was made after 12th, ROI starts from next month
+    if (day > 12) {
+      nextRoiDate = new Date(now.getFullYear(), now.getMonth() + 2, 1);
+    }
+
+    // If we're past the ROI date, move to next month
+    if (nextRoiDate < now) {
+      nextRoiDate = new Date(now.getFullYear(), now.getMonth() + 1, 1);
+    }
+
+    cached = nextRoiDate.toISOString().split('T')[0];
+    nextRoiDateCache.set(key, cached);
+  }
+  return cached;
+};
+
+const toDateKey = (date) =>
+  typeof date === 'string' ? date.slice(0, 10) : date.toISOString().split('T')[0];
+
+// First index in a sorted array whose value is >= target
+const lowerBound = (sorted, target) => {
+  let lo = 0;
+  let hi = sorted.length;
+  while (lo < hi) {
+    const mid = (lo + hi) >> 1;
+    if (sorted[mid] < target) lo = mid + 1;
+    else hi = mid;
+  }
+  return lo;
+};
+
+export class RoiDueIndex {
+  constructor() {
+    this.policies = new Map();  // policyId -> policy, including on-demand ones
+    this.buckets = new Map();   // date -> Map(policyId -> policy)
+    this.dates = [];            // sorted bucket dates
+    this.dateByPolicy = new Map();
+    this.version = 0;
+    this.listeners = new Set();
+  }
+
+  /**
+   * Call `listener` after every change; returns an unsubscribe function
+   */
+  subscribe(listener) {
+    this.listeners.add(listener);
+    return () => this.listeners.delete(listener);
+  }
+
+  changed() {
+    this.version += 1;
+    this.listeners.forEach(listener => listener());
+  }
+
+  // Number of policies with a scheduled ROI date
+  get size() {
+    return this.dateByPolicy.size;
+  }
+
+  /**
+   * Add or move a policy; only policies on monthly ROI get a due date
+   * @param {object} policy - Policy as returned by /api/investments/policies/
+   */
+  upsert(policy) {
+    if (!policy?.id) return;
+    this.insert(policy);
+    this.changed();
+  }
+
+  insert(policy) {
+    this.delete(policy.id);
+    this.policies.set(policy.id, policy);
+    if (policy.roi_frequency !== 'monthly' || !policy.start_date) return;
+
+    const date = calculateNextRoiDate(policy.start_date);
+    let bucket = this.buckets.get(date);
+    if (!bucket) {
+      bucket = new Map();
+      this.buckets.set(date, bucket);
+      this.dates.splice(lowerBound(this.dates, date), 0, date);
+    }
+    bucket.set(policy.id, policy);
+    this.dateByPolicy.set(policy.id, date);
+  }
+
+  remove(policyId) {
+    this.delete(policyId);
+    this.changed();
+  }
+
+  delete(policyId) {
+    this.policies.delete(policyId);
+    const date = this.dateByPolicy.get(policyId);
+    if (date === undefined) return;
+
+    const bucket = this.buckets.get(date);
+    bucket.delete(policyId);
+    if (bucket.size === 0) {
+      this.buckets.delete(date);
+      this.dates.splice(lowerBound(this.dates, date), 1);
+    }
+    this.dateByPolicy.delete(policyId);
+  }
+
+  /**
+   * Update a policy's ROI frequency without refetching it
+   */
+  setFrequency(policyId, roiFrequency) {
+    const policy = this.policies.get(policyId);
+    if (policy) this.upsert({ ...policy, roi_frequency: roiFrequency });
+  }
+
+  /**
+   * Replace the whole index with a fresh policy list
+   */
+  rebuild(policies) {
+    this.policies.clear();
+    this.buckets.clear();
+    this.dates = [];
+    this.dateByPolicy.clear();
+    policies.forEach(policy => policy?.id && this.insert(policy));
+    this.changed();
+  }
+
+  nextDueDate(policyId) {
+    return this.dateByPolicy.get(policyId) || null;
+  }
+
+  /**
+   * Policies due between two dates, inclusive
+   * @param {Date|string} from - Start date
+   * @param {Date|string} to - End date
+   * @returns {object[]} - Policies in due-date order
+   */
+  dueBetween(from, to) {
+    const end = toDateKey(to);
+    const due = [];
+    for (let i = lowerBound(this.dates, toDateKey(from)); i < this.dates.length && this.dates[i] <= end; i++) {
+      due.push(...this.buckets.get(this.dates[i]).values());
+    }
+    return due;
+  }
+
+  dueOn(date = new Date()) {
+    return this.dueBetween(date, date);
+  }
+
+  dueWithinDays(days, from = new Date()) {
+    const start = new Date(toDateKey(from));
+    const end = new Date(start.getTime() + days * 24 * 60 * 60 * 1000);
+    return this.dueBetween(start, end);
+  }
+}
+
+// Shared by the admin services so every view sees the same index
+export const roiDueIndex = new RoiDueIndex();
@@ -0,0 +1,189 @@
+// In-memory search index for investor and policy tables
+// Every searchable field is broken into trigrams, so a substring query only
+// has to check the records listed under its rarest trigram instead of scanning
+// every record. When nothing matches exactly, records sharing most of the
+// query's trigrams are returned instead, which tolerates small typos.
+// The index is updated record by record (add/remove/sync), never rebuilt.
+// Records are numbered in the order they were (re)indexed and every posting
+// list keeps that order, so ties are ranked without sorting the matches.
+
+const GRAM_SIZE = 3;
+const FUZZY_THRESHOLD = 0.5;
+
+// Fields are stored joined between separators. The joined text doubles as the
+// record's signature, so sync() can tell whether a record changed, and lets a
+// match be ranked with one scan of one string.
+const SEPARATOR = '\u0001';
+
+// Scores of a substring match, best first: the whole field, the start of a
+// field, the start of a word, anywhere else
+const MATCH_SCORES = [4, 3, 2.5, 2];
+
+const normalize = (value) => String(value ?? '').toLowerCase().trim();
+
+const normalizeFields = (fields) => fields.map(normalize).filter(Boolean);
+
+const joinFields = (normalized) => `${SEPARATOR}${normalized.join(SEPARATOR)}${SEPARATOR}`;
+
+const gramsOf = (text) => {
+  const grams = new Set();
+  for (let i = 0; i + GRAM_SIZE <= text.length; i++) {
+    grams.add(text.slice(i, i + GRAM_SIZE));
+  }
+  return grams;
+};
+
+// Best score over every occurrence of the query, in one pass over the text
+const matchScore = (text, query) => {
+  let best = 0;
+  for (let at = text.indexOf(query); at !== -1 && best < 4; at = text.indexOf(query, at + 1)) {
+    let score = 2;
+    if (text[at - 1] === SEPARATOR) {
+      score = text[at + query.length] === SEPARATOR ? 4 : 3;
+    } else if (text[at - 1] === ' ') {
+      score = 2.5;
+    }
+    best = Math.max(best, score);
+  }
+  return best;
+};
+
+export class SearchIndex {
+  constructor() {
+    this.documents = new Map();  // id -> { fields, text, order }
+    this.postings = new Map();   // gram -> Map(id -> document)
+    this.nextOrder = 0;
+  }
+
+  get size() {
+    return this.documents.size;
+  }
+
+  /**
+   * Index (or re-index) a record
+   * @param {*} id - Record id
+   * @param {string[]} fields - Searchable values
+   */
+  add(id, fields) {
+    this.insert(id, normalizeFields(fields));
+  }
+
+  insert(id, normalized) {
+    this.remove(id);
+    const document = {
+      fields: normalized,
+      text: joinFields(normalized),
+      order: this.nextOrder++,
+    };
+    this.documents.set(id, document);
+
+    normalized.forEach(field => {
+      gramsOf(field).forEach(gram => {
+        let ids = this.postings.get(gram);
+        if (!ids) {
+          ids = new Map();
+          this.postings.set(gram, ids);
+        }
+        ids.set(id, document);
+      });
+    });
+  }
+
+  remove(id) {
+    const document = this.documents.get(id);
+    if (!document) return;
+
+    document.fields.forEach(field => {
+      gramsOf(field).forEach(gram => {
+        const ids = this.postings.get(gram);
+        if (!ids) return;
+        ids.delete(id);
+        if (ids.size === 0) this.postings.delete(gram);
+      });
+    });
+    this.documents.delete(id);
+  }
+
+  /**
+   * Bring the index in line with a list of records
+   * Only records whose searchable values changed are re-indexed, so a freshly
+   * fetched list of mostly unchanged records costs one comparison per record.
+   * Records no longer in the list are removed.
+   * @param {object[]} items - Current records
+   * @param {function} getId - (item, index) => id
+   * @param {function} getFields - (item, index) => searchable values
+   */
+  sync(items, getId, getFields) {
+    const seen = new Set();
+    items.forEach((item, i) => {
+      const id = getId(item, i);
+      seen.add(id);
+      const normalized = normalizeFields(getFields(item, i));
+      if (this.documents.get(id)?.text !== joinFields(normalized)) {
+        this.insert(id, normalized);
+      }
+    });
+
+    [...this.documents.keys()]
+      .filter(id => !seen.has(id))
+      .forEach(id => this.remove(id));
+  }
+
+  // Records that may contain the query (id -> document): those listed under
+  // its rarest trigram, or every record for queries too short to have one
+  substringCandidates(query) {
+    if (query.length < GRAM_SIZE) return this.documents;
+
+    let smallest = null;
+    for (const gram of gramsOf(query)) {
+      const ids = this.postings.get(gram);
+      if (!ids) return new Map();
+      if (!smallest || ids.size < smallest.size) smallest = ids;
+    }
+    return smallest;
+  }
+
+  // Ids sharing enough trigrams with the query, with their similarity
+  fuzzyCandidates(query) {
+    const grams = [...gramsOf(query)];
+    const counts = new Map();
+    grams.forEach(gram => {
+      this.postings.get(gram)?.forEach((document, id) => counts.set(id, (counts.get(id) || 0) + 1));
+    });
+
+    return [...counts]
+      .map(([id, count]) => ({ id, score: count / grams.length }))
+      .filter(({ score }) => score >= FUZZY_THRESHOLD);
+  }
+
+  /**
+   * Search the index
+   * @param {string} query - Search text
+   * @param {object} options - { limit, offset, fuzzy }
+   * @returns {object} - { ids, total } with ids ranked best first
+   */
+  search(query, options = {}) {
+    const { limit = Infinity, offset = 0, fuzzy = true } = options;
+    const q = normalize(query);
+    if (!q) {
+      const ids = [...this.documents.keys()];
+      return { ids: ids.slice(offset, offset + limit), total: ids.length };
+    }
+
+    // Candidates arrive in index order, so each score group is already ranked
+    const groups = new Map(MATCH_SCORES.map(score => [score, []]));
+    for (const [id, document] of this.substringCandidates(q)) {
+      const score = matchScore(document.text, q);
+      if (score > 0) groups.get(score).push(id);
+    }
+    let ranked = [...groups.values()].flat();
+
+    if (fuzzy && ranked.length === 0 && q.length >= GRAM_SIZE) {
+      ranked = this.fuzzyCandidates(q)
+        .sort((a, b) => b.score - a.score || this.documents.get(a.id).order - this.documents.get(b.id).order)
+        .map(({ id }) => id);
+    }
+
+    return { ids: ranked.slice(offset, offset + limit), total: ranked.length };
+  }
+}